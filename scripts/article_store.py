@@ -0,0 +1,373 @@
+"""
+GameNews — Хранилище статей (SQLite)
+Вся история выпусков в одной встроенной базе вместо перезаписи
+podcasts.json: статьи, фиды, аудио и запуски лежат в отдельных
+индексированных таблицах, а podcasts.json лишь выгружается из базы.
+
+Таблицы:
+- feeds        — источники из RSS_FEEDS
+- articles     — статьи (ключ — хэш ссылки), индексы по категории, времени и дате
+- audio_assets — аудио статьи и его сведения (длительность, размер,
+                 битрейт, хэш): обновление — одна строка
+- runs         — запуски; run_articles — состав и порядок выпуска запуска
+
+Автор: GameNews Team
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS feeds (
+    url TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 1,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS feeds_name ON feeds(name);
+
+CREATE TABLE IF NOT EXISTS articles (
+    id TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    link TEXT NOT NULL,
+    image TEXT NOT NULL,
+    source TEXT NOT NULL,
+    published INTEGER,
+    date TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS articles_category_published ON articles(category, published DESC);
+CREATE INDEX IF NOT EXISTS articles_published ON articles(published DESC);
+CREATE INDEX IF NOT EXISTS articles_category_date ON articles(category, date);
+CREATE INDEX IF NOT EXISTS articles_date ON articles(date);
+
+CREATE TABLE IF NOT EXISTS audio_assets (
+    article_id TEXT PRIMARY KEY REFERENCES articles(id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    duration_sec REAL,
+    bytes INTEGER,
+    bitrate INTEGER,
+    sha256 TEXT
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    podcasts INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS run_articles (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    article_id TEXT NOT NULL REFERENCES articles(id),
+    PRIMARY KEY (run_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS run_articles_article ON run_articles(article_id);
+'''
+
+# Сведения об аудио (колонки audio_assets и поля подкаста)
+AUDIO_FIELDS = {
+    'duration_sec': 'REAL',
+    'bytes': 'INTEGER',
+    'bitrate': 'INTEGER',
+    'sha256': 'TEXT',
+}
+
+
+def article_key(item):
+    """
+    Ключ статьи: хэш ссылки (без ссылки — заголовка).
+
+    Args:
+        item: новость или подкаст с link и title
+    Returns:
+        строка из 16 hex-символов
+    """
+    source = item.get('link') or item['title']
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+
+
+class ArticleStore:
+    """
+    Доступ к базе статей. Изменения сохраняются методом close()
+    (или при выходе из with; при исключении внутри with — откатываются).
+    """
+
+    def __init__(self, path):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """
+        Добавление колонок, появившихся после создания базы.
+        """
+        columns = {row['name'] for row in self.conn.execute('PRAGMA table_info(audio_assets)')}
+        for column, column_type in AUDIO_FIELDS.items():
+            if column not in columns:
+                self.conn.execute(f'ALTER TABLE audio_assets ADD COLUMN {column} {column_type}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Ошибка посреди записи не должна оставить в базе половину запуска
+        if exc_type is not None:
+            self.conn.rollback()
+        self.close()
+
+    def sync_feeds(self, rss_feeds):
+        """
+        Запись источников из RSS_FEEDS.
+
+        Args:
+            rss_feeds: словарь {категория: [{name, url, priority}]}
+        """
+        now = time.time()
+        self.conn.executemany(
+            'INSERT INTO feeds (url, name, category, priority, updated_at) VALUES (?, ?, ?, ?, ?)'
+            ' ON CONFLICT(url) DO UPDATE SET name = excluded.name, category = excluded.category,'
+            ' priority = excluded.priority, updated_at = excluded.updated_at',
+            [
+                (feed['url'], feed['name'], category, feed.get('priority', 1), now)
+                for category, feeds in rss_feeds.items()
+                for feed in feeds
+            ]
+        )
+
+    def upsert_article(self, podcast, now=None):
+        """
+        Добавление или обновление статьи по данным подкаста.
+
+        Returns:
+            ключ статьи
+        """
+        key = article_key(podcast)
+        now = now or time.time()
+        self.conn.execute(
+            'INSERT INTO articles (id, category, title, description, link, image, source,'
+            ' published, date, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+            ' ON CONFLICT(id) DO UPDATE SET category = excluded.category, title = excluded.title,'
+            ' description = excluded.description, image = excluded.image, source = excluded.source,'
+            ' published = excluded.published, date = excluded.date, last_seen = excluded.last_seen',
+            (key, podcast['category'], podcast['title'], podcast['description'],
+             podcast.get('link', ''), podcast.get('image', ''), podcast.get('source', ''),
+             podcast.get('published'), podcast['date'], now, now)
+        )
+        return key
+
+    def set_audio(self, key, path, info=None):
+        """
+        Обновление аудио одной статьи (пустой путь — аудио нет).
+
+        Args:
+            key: ключ статьи
+            path: путь к аудио относительно сайта
+            info: сведения об аудио {duration_sec, bytes, bitrate, sha256};
+                  без них у того же пути сохраняются прежние сведения
+        Returns:
+            False, если статьи с таким ключом нет
+        """
+        if not self.conn.execute('SELECT 1 FROM articles WHERE id = ?', (key,)).fetchone():
+            return False
+        if not path:
+            self.conn.execute('DELETE FROM audio_assets WHERE article_id = ?', (key,))
+            return True
+
+        if info and info.get('sha256'):
+            values = [info.get(field) for field in AUDIO_FIELDS]
+        else:
+            row = self.conn.execute(
+                f'SELECT path, {", ".join(AUDIO_FIELDS)} FROM audio_assets WHERE article_id = ?',
+                (key,)
+            ).fetchone()
+            same = row is not None and row['path'] == path
+            values = [row[field] if same else None for field in AUDIO_FIELDS]
+
+        self.conn.execute(
+            f'INSERT INTO audio_assets (article_id, path, updated_at, {", ".join(AUDIO_FIELDS)})'
+            ' VALUES (?, ?, ?, ?, ?, ?, ?)'
+            ' ON CONFLICT(article_id) DO UPDATE SET path = excluded.path,'
+            ' updated_at = excluded.updated_at, '
+            + ', '.join(f'{field} = excluded.{field}' for field in AUDIO_FIELDS),
+            (key, path, time.time(), *values)
+        )
+        return True
+
+    def audio_paths(self):
+        """
+        Пути всех аудио, на которые ссылаются статьи архива.
+
+        Returns:
+            множество путей относительно сайта
+        """
+        return {row[0] for row in self.conn.execute('SELECT path FROM audio_assets')}
+
+    def record_run(self, podcasts):
+        """
+        Запись выпуска нового запуска: статьи, их аудио (со сведениями,
+        если они есть в подкасте) и порядок.
+
+        Args:
+            podcasts: список подкастов в порядке выпуска
+        Returns:
+            id запуска
+        """
+        now = time.time()
+        run_id = self.conn.execute(
+            'INSERT INTO runs (started_at, podcasts) VALUES (?, ?)', (now, len(podcasts))
+        ).lastrowid
+        for position, podcast in enumerate(podcasts, 1):
+            key = self.upsert_article(podcast, now)
+            self.set_audio(key, podcast.get('audio', ''), podcast)
+            self.conn.execute(
+                'INSERT INTO run_articles (run_id, position, article_id) VALUES (?, ?, ?)',
+                (run_id, position, key)
+            )
+        return run_id
+
+    def latest_run_id(self):
+        """
+        Последний запуск с выпуском (или None).
+        """
+        row = self.conn.execute('SELECT MAX(run_id) FROM run_articles').fetchone()
+        return row[0]
+
+    def _podcast(self, row, podcast_id):
+        return {
+            "id": podcast_id,
+            "title": row['title'],
+            "category": row['category'],
+            "date": row['date'],
+            "published": row['published'],
+            "image": row['image'],
+            "audio": row['path'] or "",
+            "duration_sec": row['duration_sec'],
+            "bytes": row['bytes'],
+            "bitrate": row['bitrate'],
+            "sha256": row['sha256'],
+            "description": row['description'],
+            "source": row['source'],
+            "link": row['link']
+        }
+
+    def export_podcasts(self, run_id=None):
+        """
+        Выпуск запуска в формате podcasts.json.
+
+        Args:
+            run_id: id запуска (по умолчанию — последний)
+        Returns:
+            список подкастов
+        """
+        if run_id is None:
+            run_id = self.latest_run_id()
+        rows = self.conn.execute(
+            'SELECT r.position, a.*, s.* FROM run_articles r'
+            ' JOIN articles a ON a.id = r.article_id'
+            ' LEFT JOIN audio_assets s ON s.article_id = a.id'
+            ' WHERE r.run_id = ? ORDER BY r.position',
+            (run_id,)
+        )
+        return [self._podcast(row, row['position']) for row in rows]
+
+    def articles(self, category=None, before=None, limit=50):
+        """
+        Архив статей от свежих к старым (по индексу category, published).
+
+        Args:
+            category: только эта категория (None — все)
+            before: только опубликованные раньше этого времени (Unix-время)
+            limit: сколько статей вернуть (-1 — все)
+        Returns:
+            список словарей в формате podcasts.json (id — порядковый номер)
+        """
+        query = (
+            'SELECT a.*, s.* FROM articles a'
+            ' LEFT JOIN audio_assets s ON s.article_id = a.id WHERE 1 = 1'
+        )
+        params = []
+        if category is not None:
+            query += ' AND a.category = ?'
+            params.append(category)
+        if before is not None:
+            query += ' AND a.published < ?'
+            params.append(before)
+        query += ' ORDER BY a.published DESC LIMIT ?'
+        params.append(limit)
+        rows = self.conn.execute(query, params)
+        return [self._podcast(row, n) for n, row in enumerate(rows, 1)]
+
+    def month_articles(self, month, category=None):
+        """
+        Статьи одного месяца (по дате отображения) от свежих к старым.
+
+        Args:
+            month: месяц в формате YYYY-MM
+            category: только эта категория (None — все)
+        Returns:
+            список словарей в формате podcasts.json (id — ключ статьи)
+        """
+        query = (
+            'SELECT a.*, s.* FROM articles a'
+            ' LEFT JOIN audio_assets s ON s.article_id = a.id'
+            ' WHERE a.date >= ? AND a.date < ?'
+        )
+        params = [f"{month}-01", f"{month}-32"]
+        if category is not None:
+            query += ' AND a.category = ?'
+            params.append(category)
+        query += ' ORDER BY a.published IS NULL, a.published DESC, a.date DESC'
+        return [self._podcast(row, row['id']) for row in self.conn.execute(query, params)]
+
+    def months(self, category=None):
+        """
+        Месяцы, за которые есть статьи, от новых к старым.
+        """
+        query = 'SELECT DISTINCT substr(date, 1, 7) AS month FROM articles'
+        params = []
+        if category is not None:
+            query += ' WHERE category = ?'
+            params.append(category)
+        query += ' ORDER BY month DESC'
+        return [row['month'] for row in self.conn.execute(query, params)]
+
+    def previous_month(self, month, category=None):
+        """
+        Ближайший более ранний месяц со статьями (или None).
+        """
+        query = 'SELECT MAX(date) FROM articles WHERE date < ?'
+        params = [f"{month}-01"]
+        if category is not None:
+            query += ' AND category = ?'
+            params.append(category)
+        latest = self.conn.execute(query, params).fetchone()[0]
+        return latest[:7] if latest else None
+
+    def latest_months(self):
+        """
+        Самый свежий месяц каждой категории.
+
+        Returns:
+            словарь {категория: YYYY-MM}
+        """
+        rows = self.conn.execute('SELECT category, MAX(date) FROM articles GROUP BY category')
+        return {row[0]: row[1][:7] for row in rows}
+
+    def close(self):
+        """
+        Сохранение изменений и закрытие базы.
+        """
+        self.conn.commit()
+        self.conn.close()
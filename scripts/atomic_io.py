@@ -0,0 +1,146 @@
+"""
+GameNews — Атомарная запись файлов
+Файл сначала пишется во временный файл в той же папке, сбрасывается
+на диск (fsync) и только затем переименовывается поверх целевого.
+Прерванный запуск оставляет либо старую, либо новую версию файла,
+но никогда — обрезанную.
+
+Для аудиокэша рядом с MP3 хранится контрольная сумма (<файл>.sha256):
+файл без суммы или с несовпадающей суммой считается недействительным.
+
+Автор: GameNews Team
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Суффикс временных файлов: незавершённые записи можно найти и удалить
+TEMP_SUFFIX = '.tmp'
+
+# Суффикс файла с контрольной суммой
+CHECKSUM_SUFFIX = '.sha256'
+
+
+def _fsync_dir(directory):
+    """
+    Сброс на диск записи каталога (чтобы переименование пережило сбой питания).
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        # Windows не позволяет открыть каталог — там rename и так журналируется
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_path(path):
+    """
+    Временный путь для записи сторонним кодом (gTTS, ffmpeg).
+    При успешном выходе файл сбрасывается на диск и заменяет path,
+    при исключении временный файл удаляется.
+
+    Args:
+        path: целевой путь
+    Yields:
+        путь временного файла в той же папке
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=TEMP_SUFFIX
+    )
+    os.close(fd)
+    # mkstemp создаёт файл только для владельца — выставляем обычные права
+    os.chmod(temp_path, 0o644)
+    try:
+        yield temp_path
+        with open(temp_path, 'rb+') as f:
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_dir(directory)
+
+
+def write_bytes(path, data):
+    """
+    Атомарная запись байтов.
+    """
+    with atomic_path(path) as temp_path:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+
+
+def write_text(path, text):
+    """
+    Атомарная запись текста в UTF-8.
+    """
+    write_bytes(path, text.encode('utf-8'))
+
+
+def write_json(path, data, **options):
+    """
+    Атомарная запись JSON (кириллица без экранирования).
+
+    Args:
+        path: путь к файлу
+        data: сериализуемые данные
+        options: параметры json.dumps (например, indent)
+    """
+    write_text(path, json.dumps(data, ensure_ascii=False, **options))
+
+
+def file_digest(path):
+    """
+    SHA-256 содержимого файла.
+
+    Returns:
+        (hex-строка, размер в байтах)
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def write_checksum(path):
+    """
+    Запись контрольной суммы файла в <path>.sha256.
+
+    Returns:
+        hex-строка SHA-256
+    """
+    digest, size = file_digest(path)
+    write_text(path + CHECKSUM_SUFFIX, f"{digest} {size}\n")
+    return digest
+
+
+def verify_checksum(path):
+    """
+    Проверка файла по сохранённой контрольной сумме.
+
+    Returns:
+        True, если файл и сумма есть и совпадают
+    """
+    try:
+        with open(path + CHECKSUM_SUFFIX, 'r', encoding='utf-8') as f:
+            expected_digest, expected_size = f.read().split()
+        if os.path.getsize(path) != int(expected_size):
+            return False
+        return file_digest(path)[0] == expected_digest
+    except (OSError, ValueError):
+        return False
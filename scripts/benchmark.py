@@ -0,0 +1,432 @@
+"""
+GameNews — Офлайн-бенчмарк
+Замер производительности конвейера без StopGame/GoHa/Sports.ru и Google TTS:
+синтетические RSS-фиды раздаются локальным HTTP-сервером, а вместо gTTS
+подставляется движок null с настраиваемой задержкой.
+
+Пример:
+    python scripts/benchmark.py --entries 10000 --tts-latency 0.5 --workers 4
+
+Автор: GameNews Team
+"""
+
+import argparse
+import functools
+import json
+import logging
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from html import unescape
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+# === НАСТРОЙКА ЛОГИРОВАНИЯ ===
+# Только предупреждения и без файлов: логи модулей не должны влиять на замеры
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s [%(levelname)s] %(message)s')
+logger = logging.getLogger('GameNews_Bench')
+logger.setLevel(logging.INFO)
+
+import feedparser
+
+import feed_stream
+import metrics
+import resilience
+import rss_parser
+import generate_podcast
+import tts_backends
+
+# Словарь для синтетических заголовков и описаний
+WORDS = (
+    "турнир финал матч команда игрок релиз обновление патч обзор превью "
+    "киберспорт стрим трансфер чемпионат сезон карта герой билд рейтинг "
+    "Dota CS2 Valorant League Steam PlayStation Xbox Nintendo GTA Witcher"
+).split()
+
+# Словарь синтетических записей фидов: на одних WORDS все истории похожи
+# друг на друга и отсеиваются поиском почти-дубликатов
+_SYLLABLES = "ка ро ми ту за ле но ви да се пу ри то ла ме ки бо ны жа гу".split()
+VOCABULARY = WORDS + [a + b + c for a in _SYLLABLES for b in _SYLLABLES for c in _SYLLABLES]
+
+# Доля записей фида — почти-копий предыдущей истории (проверка отсева)
+NEAR_DUPLICATE_SHARE = 0.1
+
+
+def make_summary(rng, paragraphs=6):
+    """
+    HTML-насыщенное описание: абзацы, разметка, сущности и картинки.
+
+    Args:
+        rng: генератор случайных чисел
+        paragraphs: количество абзацев
+    Returns:
+        строка HTML
+    """
+    parts = []
+    for n in range(paragraphs):
+        words = ' '.join(rng.choice(VOCABULARY) for _ in range(40))
+        parts.append(
+            f'<p class="p{n}"><b>{rng.choice(VOCABULARY)}</b> {words} &laquo;{rng.choice(VOCABULARY)}&raquo; '
+            f'&amp; <a href="https://example.com/{n}">ссылка</a></p>'
+            f'<img src="https://img.example.com/{rng.randrange(10 ** 6)}.jpg" alt="">'
+        )
+    return ''.join(parts)
+
+
+def make_feed(name, entries, seed=0):
+    """
+    Генерация RSS 2.0 документа: различные истории, среди которых
+    доля NEAR_DUPLICATE_SHARE — почти-копии предыдущей истории.
+
+    Args:
+        name: название фида
+        entries: количество записей
+        seed: зерно генератора для воспроизводимости
+    Returns:
+        XML в виде bytes
+    """
+    rng = random.Random(seed)
+    items = []
+    title = summary = None
+    for i in range(entries):
+        if title is not None and rng.random() < NEAR_DUPLICATE_SHARE:
+            title = f"{title} — подробности"
+        else:
+            title = ' '.join(rng.choice(VOCABULARY) for _ in range(8))
+            summary = make_summary(rng)
+        day = 1 + i % 28
+        items.append(
+            f'<item><title>{title}</title>'
+            f'<link>https://example.com/{name}/{i}</link>'
+            f'<guid>{name}-{i}</guid>'
+            f'<pubDate>Mon, {day:02d} Feb 2026 {i % 24:02d}:{i % 60:02d}:00 +0000</pubDate>'
+            f'<description><![CDATA[{summary}]]></description>'
+            f'<enclosure url="https://img.example.com/{name}/{i}.jpg" type="image/jpeg" length="0"/>'
+            f'</item>'
+        )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+        f'<title>{name}</title>{"".join(items)}</channel></rss>'
+    ).encode('utf-8')
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """Раздача файлов без вывода каждого запроса в консоль."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _BenchServer(ThreadingHTTPServer):
+    """Сервер, не шумящий обрывами: потоковый разбор закрывает соединение досрочно."""
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+
+def start_server(directory):
+    """
+    Запуск локального HTTP-сервера в фоновом потоке.
+
+    Args:
+        directory: папка с файлами фидов
+    Returns:
+        (сервер, базовый URL)
+    """
+    handler = functools.partial(_QuietHandler, directory=directory)
+    server = _BenchServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def bench_collect(base_url, feeds, concurrency):
+    """
+    Замер collect_all_news на локальных фидах.
+
+    Returns:
+        (секунды, количество подкастов)
+    """
+    rss_parser.RSS_FEEDS = {}
+    for n in range(feeds):
+        category = f"Категория {n % 3 + 1}"
+        rss_parser.RSS_FEEDS.setdefault(category, []).append({
+            "name": f"feed{n}",
+            "url": f"{base_url}/feed{n}.xml",
+            "priority": n // 3 + 1,
+        })
+
+    started = time.perf_counter()
+    podcasts = rss_parser.collect_all_news(concurrency=concurrency, use_cache=False)
+    return time.perf_counter() - started, len(podcasts)
+
+
+def bench_dedup(items, seed=0):
+    """
+    Замер remove_duplicates на синтетическом списке (~20% дубликатов).
+
+    Returns:
+        (секунды, уникальных элементов)
+    """
+    rng = random.Random(seed)
+    titles = [' '.join(rng.choice(WORDS) for _ in range(8)) + f" {i}" for i in range(items)]
+    news = []
+    for i in range(items):
+        title = titles[i] if rng.random() > 0.2 else titles[rng.randrange(max(1, i))].upper() + '!'
+        news.append({"title": title, "description": title, "date": "2026-02-01", "source": "bench"})
+
+    started = time.perf_counter()
+    unique = rss_parser.remove_duplicates(news)
+    return time.perf_counter() - started, len(unique)
+
+
+def clean_html_legacy(text):
+    """
+    Прежняя реализация clean_html (три прохода: теги, сущности, пробелы) —
+    эталон для сравнения результата и скорости.
+    """
+    if not text:
+        return ""
+    clean = re.sub(r'<[^>]+>', '', text)
+    clean = unescape(clean)
+    clean = re.sub(r'\s+', ' ', clean).strip()
+    return clean
+
+
+# Эталонные строки для сравнения clean_html с прежней реализацией
+GOLDEN_HTML = [
+    '',
+    'Простой текст',
+    '<p>Абзац</p><p>ещё   один</p>',
+    'Турнир &laquo;Major&raquo; &amp; призы &nbsp; 1&nbsp;000&nbsp;$',
+    '<a href="https://example.com">ссылка</a>&#8212;тире &#x2014; и &hellip;',
+    '  \n\t<br/>пробелы\n\n по краям <br>  ',
+    '<img src="x.jpg" alt="">Картинка<img src="y.jpg">',
+    'Сущность без точки с запятой: &amp &lt &copy 2026',
+    'Неизвестная &foo; и битая & сущность',
+    'Стрелка > и < без тегов',
+]
+
+# Случаи, где clean_html намеренно расходится с прежней реализацией:
+# содержимое <script>, <style> и CDATA отбрасывается (вход → ожидаемый результат)
+EXPECTED_HTML = [
+    ('До<script>var x = "<b>1</b>";</script>после', 'Допосле'),
+    ('<p>Текст</p><SCRIPT type="text/javascript">\nalert(1)\n</SCRIPT > конец', 'Текст конец'),
+    ('<style>.card { color: red; }</style>Обзор игры', 'Обзор игры'),
+    ('<style media="all">p{}</style><p>Первый</p><style>a{}</style> <p>второй</p>', 'Первый второй'),
+    ('Начало <![CDATA[<b>скрытый</b> текст]]> конец', 'Начало конец'),
+    ('<![CDATA[\nесли a > b\n]]>Итог &amp; вывод', 'Итог & вывод'),
+]
+
+
+def bench_clean_html(items, paragraphs=60, seed=0):
+    """
+    Сравнение clean_html с прежней реализацией на крупных описаниях:
+    время обеих версий, совпадение результата на эталонном корпусе
+    и ожидаемый результат для script/style/CDATA (EXPECTED_HTML).
+
+    Returns:
+        словарь с результатами
+    """
+    rng = random.Random(seed)
+    corpus = [make_summary(rng, paragraphs) for _ in range(items)]
+    golden = GOLDEN_HTML + corpus
+
+    mismatches = sum(
+        1 for text in golden
+        if rss_parser.clean_html(text) != clean_html_legacy(text)
+    )
+    mismatches += sum(
+        1 for text, expected in EXPECTED_HTML
+        if rss_parser.clean_html(text) != expected
+    )
+
+    started = time.perf_counter()
+    for text in corpus:
+        clean_html_legacy(text)
+    legacy_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for text in corpus:
+        rss_parser.clean_html(text)
+    single_pass_sec = time.perf_counter() - started
+
+    return {
+        "items": items,
+        "avg_chars": sum(map(len, corpus)) // max(1, items),
+        "legacy_seconds": round(legacy_sec, 4),
+        "single_pass_seconds": round(single_pass_sec, 4),
+        "golden_cases": len(golden) + len(EXPECTED_HTML),
+        "golden_mismatches": mismatches,
+    }
+
+
+def bench_stream_parse(feeds, entries):
+    """
+    Сравнение parse_feed на записях потокового разбора и feedparser
+    для тех же фидов make_feed (заголовки, описания, ссылки, картинки, даты).
+
+    Returns:
+        словарь с результатами
+    """
+    limit = rss_parser.MAX_NEWS_PER_CATEGORY * 2
+    compared = 0
+    mismatches = 0
+    for n in range(feeds):
+        data = make_feed(f"feed{n}", entries, seed=n)
+        config = {"name": f"feed{n}", "url": f"https://example.com/feed{n}.xml", "priority": 1}
+        streamed = feedparser.FeedParserDict(
+            bozo=False, entries=list(feed_stream.iter_entries([data], limit))
+        )
+        expected = rss_parser.parse_feed(config, feedparser.parse(data))
+        actual = rss_parser.parse_feed(config, streamed)
+        compared += max(len(expected), len(actual))
+        mismatches += sum(1 for a, b in zip(expected, actual) if a != b)
+        mismatches += abs(len(expected) - len(actual))
+
+    return {"items": compared, "mismatches": mismatches}
+
+
+def bench_tts(items, workers):
+    """
+    Замер этапа озвучки на заглушке TTS.
+
+    Returns:
+        (секунды, успешно озвучено)
+    """
+    podcasts = [
+        {"id": i, "title": f"Новость {i}", "description": f"Описание новости номер {i}. " * 5}
+        for i in range(1, items + 1)
+    ]
+    started = time.perf_counter()
+    results = generate_podcast.generate_all_audio(podcasts, workers, from_files=False)
+    return time.perf_counter() - started, sum(1 for r in results if r)
+
+
+def run_benchmark(entries=100, feeds=6, concurrency=rss_parser.FETCH_CONCURRENCY,
+                  dedup_items=10000, tts_items=15, tts_latency=0.5,
+                  workers=generate_podcast.TTS_WORKERS, html_items=200):
+    """
+    Полный прогон бенчмарка во временной папке.
+
+    Returns:
+        словарь с результатами
+    """
+    workdir = tempfile.mkdtemp(prefix='gamenews-bench-')
+    feeds_dir = os.path.join(workdir, 'feeds')
+    os.makedirs(feeds_dir)
+
+    # Все выходные файлы — во временную папку, а не в репозиторий
+    rss_parser.OUTPUT_DIR = workdir
+    generate_podcast.BASE_DIR = workdir
+    generate_podcast.AUDIO_DIR = os.path.join(workdir, 'audio')
+    generate_podcast.TEXTS_DIR = os.path.join(workdir, 'texts')
+    generate_podcast.PODCASTS_JSON = os.path.join(workdir, 'podcasts.json')
+    os.makedirs(generate_podcast.AUDIO_DIR)
+    generate_podcast.set_backend(tts_backends.NullBackend(latency=tts_latency))
+
+    logger.info(f"Генерирую {feeds} фидов по {entries} записей...")
+    total_bytes = 0
+    for n in range(feeds):
+        data = make_feed(f"feed{n}", entries, seed=n)
+        total_bytes += len(data)
+        with open(os.path.join(feeds_dir, f"feed{n}.xml"), 'wb') as f:
+            f.write(data)
+
+    server, base_url = start_server(feeds_dir)
+    # Локальный сервер — не внешний хост: ограничение частоты исказило бы замер
+    resilience.HOST_RATES['127.0.0.1'] = (1e6, feeds)
+    resilience.reset()
+    metrics.reset()
+    try:
+        collect_sec, collected = bench_collect(base_url, feeds, concurrency)
+        dedup_sec, unique = bench_dedup(dedup_items)
+        clean_html_results = bench_clean_html(html_items)
+        stream_parse_results = bench_stream_parse(feeds, entries)
+        tts_sec, voiced = bench_tts(tts_items, workers)
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "params": {
+            "feeds": feeds,
+            "entries_per_feed": entries,
+            "feed_bytes_total": total_bytes,
+            "concurrency": concurrency,
+            "dedup_items": dedup_items,
+            "tts_items": tts_items,
+            "tts_latency": tts_latency,
+            "workers": workers,
+            "stream_parse": rss_parser.STREAM_PARSE,
+            "near_dedup": rss_parser.NEAR_DEDUP,
+        },
+        "collect_all_news": {"seconds": round(collect_sec, 4), "podcasts": collected},
+        "remove_duplicates": {
+            "seconds": round(dedup_sec, 4),
+            "unique": unique,
+            "items_per_sec": round(dedup_items / dedup_sec, 1) if dedup_sec else None,
+        },
+        "clean_html": clean_html_results,
+        "stream_parse": stream_parse_results,
+        "tts": {
+            "seconds": round(tts_sec, 4),
+            "voiced": voiced,
+            "items_per_sec": round(tts_items / tts_sec, 2) if tts_sec else None,
+        },
+        "stages": metrics.build_report()['stages'],
+    }
+
+
+def parse_args():
+    """
+    Разбор аргументов командной строки.
+
+    Returns:
+        argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description='GameNews — офлайн-бенчмарк конвейера')
+    parser.add_argument('--entries', type=int, default=100, help='записей в каждом фиде (10..100000)')
+    parser.add_argument('--feeds', type=int, default=6, help='количество фидов')
+    parser.add_argument('--concurrency', type=int, default=rss_parser.FETCH_CONCURRENCY,
+                        help='сколько фидов качать одновременно')
+    parser.add_argument('--dedup-items', type=int, default=10000, help='элементов для remove_duplicates')
+    parser.add_argument('--html-items', type=int, default=200,
+                        help='крупных описаний для сравнения clean_html')
+    parser.add_argument('--tts-items', type=int, default=15, help='текстов для озвучки')
+    parser.add_argument('--tts-latency', type=float, default=0.5, help='задержка заглушки TTS, секунды')
+    parser.add_argument('--workers', type=int, default=generate_podcast.TTS_WORKERS,
+                        help='сколько подкастов озвучивать одновременно')
+    parser.add_argument('--no-stream-parse', action='store_true',
+                        help='скачивать фиды целиком и разбирать feedparser')
+    parser.add_argument('--no-near-dedup', action='store_true',
+                        help='только точные дубликаты заголовков')
+    parser.add_argument('--output', help='записать результаты в JSON-файл')
+    return parser.parse_args()
+
+
+# === ЗАПУСК ===
+if __name__ == '__main__':
+    args = parse_args()
+    rss_parser.STREAM_PARSE = not args.no_stream_parse
+    rss_parser.NEAR_DEDUP = not args.no_near_dedup
+    results = run_benchmark(
+        entries=args.entries,
+        feeds=args.feeds,
+        concurrency=args.concurrency,
+        dedup_items=args.dedup_items,
+        tts_items=args.tts_items,
+        tts_latency=args.tts_latency,
+        workers=args.workers,
+        html_items=args.html_items,
+    )
+    report = json.dumps(results, ensure_ascii=False, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report)
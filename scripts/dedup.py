@@ -0,0 +1,159 @@
+"""
+GameNews — Поиск почти-дубликатов (MinHash + LSH)
+Одна и та же новость с разных сайтов (Cyber.Sports.ru, GoHa.ru) отличается
+формулировками, поэтому точное сравнение заголовков её не ловит.
+Для каждой новости строится MinHash-подпись множества шинглов
+(заголовок + описание), а LSH-бандинг отбирает кандидатов без попарных
+сравнений — время растёт почти линейно от числа новостей.
+
+Подпись считается методом one permutation hashing: каждый шингл хэшируется
+один раз и попадает в одну из NUM_HASHES корзин, пустые корзины заполняются
+ротацией (densification). Это даёт оценку сходства Жаккара, как у обычного
+MinHash, но за O(число шинглов), а не O(шинглы × хэши).
+
+На коротких новостях (десяток шинглов) оценка завышает сходство, поэтому
+подпись только отбирает кандидатов, а решение принимается по точному
+сходству Жаккара их множеств шинглов. Новости, где шинглов меньше
+MIN_SHINGLES, почти-дубликатами не считаются (их ловит сравнение заголовков).
+
+Автор: GameNews Team
+"""
+
+import re
+import zlib
+
+# Размер подписи и разбиение на полосы LSH: BANDS * ROWS == NUM_HASHES.
+# При 16 × 4 вероятность стать кандидатами резко растёт около сходства 0.5
+NUM_HASHES = 64
+BANDS = 16
+ROWS = NUM_HASHES // BANDS
+
+# Минимальное точное сходство Жаккара, чтобы считать новости дубликатами
+SIMILARITY_THRESHOLD = 0.8
+
+# Меньше шинглов — слишком мало текста для надёжного сравнения
+MIN_SHINGLES = 8
+
+# Длина «основы» слова: грубая замена стемминга для русских окончаний
+STEM_LENGTH = 6
+
+_WORD = re.compile(r'\w+')
+_BIN_MASK = NUM_HASHES - 1
+_BIN_BITS = NUM_HASHES.bit_length() - 1
+
+
+def shingles(item):
+    """
+    Множество шинглов новости: основы слов заголовка и описания
+    плюс пары соседних основ заголовка (порядок слов в заголовке важен).
+
+    Args:
+        item: новость с title и description
+    Returns:
+        множество строк
+    """
+    title = [w[:STEM_LENGTH] for w in _WORD.findall(item['title'].lower()) if len(w) > 2]
+    description = [
+        w[:STEM_LENGTH] for w in _WORD.findall(item.get('description', '').lower()) if len(w) > 2
+    ]
+
+    result = set(title)
+    result.update(description)
+    result.update(f"{a} {b}" for a, b in zip(title, title[1:]))
+    return result
+
+
+def signature(shingle_set):
+    """
+    MinHash-подпись (one permutation hashing с ротационным заполнением).
+
+    Args:
+        shingle_set: множество шинглов
+    Returns:
+        кортеж из NUM_HASHES целых или None для пустого множества
+    """
+    if not shingle_set:
+        return None
+
+    bins = [None] * NUM_HASHES
+    for shingle in shingle_set:
+        h = zlib.crc32(shingle.encode('utf-8'))
+        index = h & _BIN_MASK
+        value = h >> _BIN_BITS
+        current = bins[index]
+        if current is None or value < current:
+            bins[index] = value
+
+    # Пустая корзина берёт значение ближайшей непустой справа (по кругу)
+    # со смещением на расстояние, чтобы совпадения не были случайными
+    for index in range(NUM_HASHES):
+        if bins[index] is not None:
+            continue
+        step = 1
+        while bins[(index + step) % NUM_HASHES] is None:
+            step += 1
+        bins[index] = -(bins[(index + step) % NUM_HASHES] + step * (1 << 27))
+
+    return tuple(bins)
+
+
+def similarity(sig_a, sig_b):
+    """
+    Оценка сходства Жаккара по доле совпавших позиций подписей.
+    """
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_HASHES
+
+
+def jaccard(set_a, set_b):
+    """
+    Точное сходство Жаккара двух множеств шинглов.
+    """
+    if not set_a or not set_b:
+        return 0.0
+    common = len(set_a & set_b)
+    return common / (len(set_a) + len(set_b) - common)
+
+
+def near_duplicate_groups(items, threshold=SIMILARITY_THRESHOLD):
+    """
+    Разбиение новостей на группы почти-дубликатов.
+    Кандидаты берутся из общих корзин LSH и сверяются с первой новостью
+    корзины по точному сходству Жаккара, поэтому число сравнений
+    не превышает числа новостей × BANDS.
+
+    Args:
+        items: список новостей
+        threshold: минимальное сходство для объединения
+    Returns:
+        список номеров групп (по индексу новости)
+    """
+    parent = list(range(len(items)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    shingle_sets = [shingles(item) for item in items]
+    signatures = [
+        signature(shingle_set) if len(shingle_set) >= MIN_SHINGLES else None
+        for shingle_set in shingle_sets
+    ]
+    buckets = {}
+
+    for i, sig in enumerate(signatures):
+        if sig is None:
+            continue
+        for band in range(BANDS):
+            key = (band, sig[band * ROWS:(band + 1) * ROWS])
+            first = buckets.setdefault(key, i)
+            if first == i:
+                continue
+            root_i, root_first = find(i), find(first)
+            if root_i == root_first:
+                continue
+            if jaccard(shingle_sets[i], shingle_sets[first]) >= threshold:
+                parent[root_i] = root_first
+
+    return [find(i) for i in range(len(items))]
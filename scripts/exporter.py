@@ -0,0 +1,243 @@
+"""
+GameNews — Статическая выгрузка для веб-плеера
+Вместо одного растущего podcasts.json страница получает:
+
+- data/latest.json — небольшой манифест: выпуск последнего запуска
+  и ссылки на самые свежие месячные части архива;
+- data/months/YYYY-MM.json — все статьи месяца;
+- data/categories/<категория>/YYYY-MM.json — статьи месяца одной категории;
+- data/search.<хэш>.json — поисковый индекс по всему архиву (см. search_index.py).
+
+Каждая часть ссылается на предыдущую (prev), поэтому манифест не растёт
+вместе с архивом, а страница догружает части по мере прокрутки.
+Адреса частей постоянны: прошлые месяцы не меняются и хорошо кэшируются.
+Все файлы минифицированы и лежат вместе со сжатыми копиями .gz/.br
+(см. precompress.py).
+
+Автор: GameNews Team
+"""
+
+import argparse
+import json
+import logging
+import os
+from datetime import datetime, timezone
+
+import precompress
+import search_index
+from article_store import ArticleStore
+
+logger = logging.getLogger('GameNews_Exporter')
+
+# Корень сайта (рядом с index.html)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Папка выгрузки относительно корня сайта
+EXPORT_DIR = 'data'
+
+MANIFEST_NAME = 'latest.json'
+
+# Поисковый индекс выгружается под именем search.<хэш>.json
+SEARCH_NAME = 'search.json'
+
+# Страница сайта: для неё пишутся только сжатые копии
+PAGE_NAME = 'index.html'
+
+# Транслитерация названий категорий для адресов частей
+_TRANSLIT = dict(zip(
+    'абвгдеёжзийклмнопрстуфхцчшщъыьэюя',
+    ['a', 'b', 'v', 'g', 'd', 'e', 'e', 'zh', 'z', 'i', 'y', 'k', 'l', 'm', 'n', 'o', 'p',
+     'r', 's', 't', 'u', 'f', 'h', 'ts', 'ch', 'sh', 'sch', '', 'y', '', 'e', 'yu', 'ya']
+))
+
+
+def category_slug(category):
+    """
+    Латинское имя категории для URL: 'Турниры' → 'turniry'.
+    """
+    slug = ''.join(_TRANSLIT.get(ch, ch) for ch in category.lower())
+    slug = ''.join(ch if ch.isascii() and ch.isalnum() else '-' for ch in slug)
+    return '-'.join(part for part in slug.split('-') if part) or 'category'
+
+
+def shard_url(month, category=None):
+    """
+    Адрес части архива относительно корня сайта.
+
+    Args:
+        month: месяц YYYY-MM (None — части нет)
+        category: категория (None — все категории)
+    Returns:
+        строка URL или None
+    """
+    if month is None:
+        return None
+    if category is None:
+        return f"{EXPORT_DIR}/months/{month}.json"
+    return f"{EXPORT_DIR}/categories/{category_slug(category)}/{month}.json"
+
+
+def _write_if_changed(output_dir, url, data):
+    """
+    Запись минифицированного JSON со сжатыми копиями, только если
+    содержимое изменилось (неизменные части не перезаписываются
+    и не попадают в коммит).
+
+    Returns:
+        True, если файл записан
+    """
+    path = os.path.join(output_dir, url)
+    payload = precompress.minify_json(data)
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == payload and precompress.has_siblings(path):
+                return False
+    except FileNotFoundError:
+        pass
+    precompress.write_asset(path, payload, url)
+    return True
+
+
+def export_shard(store, output_dir, month, category=None):
+    """
+    Выгрузка одной части архива.
+
+    Returns:
+        True, если файл записан
+    """
+    data = {
+        "month": month,
+        "category": category,
+        "podcasts": store.month_articles(month, category),
+        "prev": shard_url(store.previous_month(month, category), category),
+    }
+    return _write_if_changed(output_dir, shard_url(month, category), data)
+
+
+def _with_next(months, touched):
+    """
+    Затронутые месяцы плюс следующий за каждым из них:
+    у следующей части могла измениться ссылка prev.
+
+    Args:
+        months: все месяцы области (YYYY-MM)
+        touched: изменившиеся месяцы
+    Returns:
+        множество месяцев для перевыгрузки
+    """
+    ordered = sorted(months)
+    result = set()
+    for index, month in enumerate(ordered):
+        if month in touched:
+            result.add(month)
+            if index + 1 < len(ordered):
+                result.add(ordered[index + 1])
+    return result
+
+
+def export_manifest(store, output_dir, podcasts, search=None):
+    """
+    Выгрузка манифеста data/latest.json.
+
+    Args:
+        store: ArticleStore
+        output_dir: корень сайта
+        podcasts: выпуск последнего запуска
+        search: адрес поискового индекса
+    """
+    latest = store.latest_months()
+    manifest = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "podcasts": podcasts,
+        "archive": shard_url(max(latest.values()) if latest else None),
+        "categories": {category: shard_url(month, category) for category, month in latest.items()},
+        "search": search,
+    }
+    precompress.write_json(
+        os.path.join(output_dir, EXPORT_DIR, MANIFEST_NAME), manifest, f"{EXPORT_DIR}/{MANIFEST_NAME}"
+    )
+
+
+def _manifest_search(output_dir):
+    """
+    Адрес индекса из текущего манифеста (или None).
+    """
+    try:
+        with open(os.path.join(output_dir, EXPORT_DIR, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f).get('search')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def export_search(store, output_dir):
+    """
+    Выгрузка поискового индекса по всем статьям архива под именем
+    с хэшем содержимого. Остаются текущая версия и версия из прошлого
+    манифеста (для уже открытых страниц), остальные удаляются.
+
+    Returns:
+        адрес индекса относительно сайта
+    """
+    payload = precompress.minify_json(search_index.build_index(store.articles(limit=-1)))
+    url = f"{EXPORT_DIR}/{precompress.hashed_name(SEARCH_NAME, payload)}"
+    path = os.path.join(output_dir, url)
+    if not (os.path.exists(path) and precompress.has_siblings(path)):
+        precompress.write_asset(path, payload, url)
+
+    previous = _manifest_search(output_dir)
+    keep = {os.path.basename(url), os.path.basename(previous or '')}
+    precompress.remove_stale(os.path.join(output_dir, EXPORT_DIR), SEARCH_NAME, keep)
+    return url
+
+
+def export_static(store, output_dir=None, months=None):
+    """
+    Выгрузка манифеста, частей архива, поискового индекса
+    и сжатых копий страницы.
+
+    Args:
+        store: ArticleStore
+        output_dir: корень сайта (по умолчанию BASE_DIR)
+        months: какие месяцы перевыгрузить (None — весь архив)
+    Returns:
+        сколько частей записано
+    """
+    output_dir = output_dir or BASE_DIR
+    all_months = store.months()
+    touched = set(all_months if months is None else months)
+
+    written = 0
+    for month in _with_next(all_months, touched):
+        written += export_shard(store, output_dir, month)
+    for category in store.latest_months():
+        for month in _with_next(store.months(category), touched):
+            written += export_shard(store, output_dir, month, category)
+
+    search = export_search(store, output_dir)
+    export_manifest(store, output_dir, store.export_podcasts(), search)
+    precompress.compress_file(os.path.join(output_dir, PAGE_NAME), PAGE_NAME)
+    logger.info(f"Статическая выгрузка: манифест и {written} изменённых частей в {EXPORT_DIR}/")
+    return written
+
+
+def parse_args():
+    """
+    Разбор аргументов командной строки.
+
+    Returns:
+        argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description='GameNews — выгрузка архива для сайта')
+    parser.add_argument(
+        '--store', default=os.path.join(BASE_DIR, 'data', 'articles.sqlite'),
+        help='путь к базе статей'
+    )
+    return parser.parse_args()
+
+
+# === ЗАПУСК ===
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    args = parse_args()
+    with ArticleStore(args.store) as article_store:
+        export_static(article_store)
@@ -0,0 +1,155 @@
+"""
+GameNews — Потоковый разбор RSS/Atom
+Записи разбираются по мере поступления байтов (XMLPullParser), и чтение
+прекращается, как только набрано нужное количество записей.
+Результат — те же FeedParserDict, что отдаёт feedparser, поэтому
+clean_html, extract_image и parse_date работают с ними без изменений.
+
+Автор: GameNews Team
+"""
+
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_tz, mktime_tz
+
+from feedparser import FeedParserDict
+
+# Локальные имена элементов-записей: RSS 2.0 / RSS 1.0 и Atom
+ENTRY_TAGS = {'item', 'entry'}
+
+# Поля с датой в порядке предпочтения
+PUBLISHED_TAGS = ('pubDate', 'published', 'date', 'issued')
+UPDATED_TAGS = ('updated', 'modified')
+
+
+def _local(tag):
+    """
+    Имя тега без пространства имён: '{ns}item' → 'item'.
+    """
+    return tag.rsplit('}', 1)[-1]
+
+
+def _parse_datetime(value):
+    """
+    Разбор даты RFC 822 (RSS) или ISO 8601 (Atom) в struct_time UTC,
+    как published_parsed у feedparser.
+
+    Args:
+        value: строка даты
+    Returns:
+        time.struct_time или None
+    """
+    value = (value or '').strip()
+    if not value:
+        return None
+
+    parsed = parsedate_tz(value)
+    if parsed:
+        try:
+            return time.gmtime(mktime_tz(parsed))
+        except (OverflowError, ValueError):
+            return None
+
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).timetuple()
+
+
+def element_to_entry(element):
+    """
+    Преобразование XML-элемента записи в FeedParserDict.
+
+    Args:
+        element: элемент <item> или <entry>
+    Returns:
+        FeedParserDict с title, summary, link, id, датами и медиа
+    """
+    entry = FeedParserDict()
+    media_content = []
+    media_thumbnail = []
+    # Как у feedparser: вложения — ссылки с rel="enclosure",
+    # entry.enclosures собирается из них при обращении
+    links = []
+
+    for child in element:
+        name = _local(child.tag)
+        text = (child.text or '').strip()
+
+        if name == 'title':
+            entry['title'] = text
+        elif name == 'content' and child.get('url'):
+            # media:content — вложение, а не текст
+            media_content.append({'url': child.get('url'), 'type': child.get('type', '')})
+        elif name in ('description', 'summary'):
+            entry['summary'] = text
+        elif name in ('content', 'encoded'):
+            entry.setdefault('summary', text)
+        elif name == 'link':
+            href = child.get('href')
+            if href:
+                rel = child.get('rel', 'alternate')
+                links.append({'rel': rel, 'href': href, 'type': child.get('type', '')})
+                # Atom: берём rel="alternate" (или ссылку без rel)
+                if rel == 'alternate':
+                    entry.setdefault('link', href)
+            elif text:
+                entry.setdefault('link', text)
+        elif name in ('guid', 'id'):
+            entry['id'] = text
+        elif name in PUBLISHED_TAGS and 'published_parsed' not in entry:
+            entry['published'] = text
+            entry['published_parsed'] = _parse_datetime(text)
+        elif name in UPDATED_TAGS and 'updated_parsed' not in entry:
+            entry['updated'] = text
+            entry['updated_parsed'] = _parse_datetime(text)
+        elif name == 'thumbnail' and child.get('url'):
+            media_thumbnail.append({'url': child.get('url')})
+        elif name == 'enclosure' and child.get('url'):
+            links.append({'rel': 'enclosure', 'href': child.get('url'), 'type': child.get('type', '')})
+
+    if media_content:
+        entry['media_content'] = media_content
+    if media_thumbnail:
+        entry['media_thumbnail'] = media_thumbnail
+    if links:
+        entry['links'] = links
+    return entry
+
+
+def iter_entries(chunks, limit):
+    """
+    Потоковый разбор: записи отдаются по мере декодирования,
+    чтение chunks прекращается после limit записей.
+
+    Args:
+        chunks: итератор кусков XML (bytes)
+        limit: сколько записей нужно
+    Yields:
+        FeedParserDict для каждой записи
+    Raises:
+        xml.etree.ElementTree.ParseError: документ не является корректным XML
+    """
+    if limit <= 0:
+        return
+
+    parser = ET.XMLPullParser(events=('end',))
+    count = 0
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            if _local(element.tag) not in ENTRY_TAGS:
+                continue
+            yield element_to_entry(element)
+            # Разобранная запись больше не нужна — освобождаем память
+            element.clear()
+            count += 1
+            if count >= limit:
+                return
+
+    parser.close()
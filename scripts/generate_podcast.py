@@ -1,15 +1,32 @@
 """
 GameNews — Генератор подкастов (TTS)
-Озвучка текстов новостей через gTTS (Google Text-to-Speech).
+Озвучка текстов новостей через gTTS (Google Text-to-Speech)
+или другой движок из tts_backends.
 Обновляет podcasts.json с путями к аудиофайлам.
 
 Автор: GameNews Team
 """
 
+import argparse
+import functools
+import hashlib
 import json
 import os
+import re
 import logging
-from gtts import gTTS
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+import atomic_io
+import exporter
+import metrics
+import mp3_probe
+import precompress
+import resilience
+import tts_backends
+from article_store import ArticleStore, article_key
 
 # === НАСТРОЙКА ЛОГИРОВАНИЯ ===
 logging.basicConfig(
@@ -27,6 +44,67 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 PODCASTS_JSON = os.path.join(BASE_DIR, 'podcasts.json')
 TEXTS_DIR = os.path.join(BASE_DIR, 'texts')
 AUDIO_DIR = os.path.join(BASE_DIR, 'audio')
+RUN_REPORT_FILE = os.path.join(BASE_DIR, 'run_report.json')
+ARTICLE_STORE_FILE = os.path.join(BASE_DIR, 'data', 'articles.sqlite')
+
+# === ПАРАМЕТРЫ ОЗВУЧКИ ===
+TTS_LANG = 'ru'     # Русский язык
+TTS_SLOW = False    # Нормальная скорость
+
+# Движок озвучки: gtts (Google), espeak (локальный, офлайн) или null (заглушка)
+TTS_BACKEND = os.environ.get('GAMENEWS_TTS_BACKEND', 'gtts')
+
+_backend = None
+
+# Сколько подкастов озвучивать одновременно (1 — последовательно)
+TTS_WORKERS = 4
+
+# Блокировки по имени аудиофайла: одинаковые тексты не пишутся дважды параллельно
+_audio_locks = {}
+_audio_locks_guard = threading.Lock()
+
+
+def get_backend():
+    """
+    Текущий движок озвучки (создаётся при первом обращении по TTS_BACKEND).
+    
+    Returns:
+        экземпляр движка из tts_backends
+    """
+    global _backend
+    if _backend is None:
+        set_backend(TTS_BACKEND)
+    return _backend
+
+
+def set_backend(backend):
+    """
+    Выбор движка озвучки.
+    
+    Args:
+        backend: имя движка (gtts, espeak, null) или готовый экземпляр
+    """
+    global _backend
+    if isinstance(backend, str):
+        options = {}
+        if backend == 'gtts':
+            options = {'lang': TTS_LANG, 'slow': TTS_SLOW, 'timeout': resilience.TIMEOUT}
+        backend = tts_backends.create_backend(backend, **options)
+    _backend = backend
+    logger.info(f"Движок озвучки: {backend.name}")
+
+
+def _audio_lock(audio_name):
+    """
+    Блокировка для конкретного аудиофайла.
+    
+    Args:
+        audio_name: имя файла в AUDIO_DIR
+    Returns:
+        threading.Lock
+    """
+    with _audio_locks_guard:
+        return _audio_locks.setdefault(audio_name, threading.Lock())
 
 
 def load_podcasts():
@@ -49,32 +127,73 @@ def load_podcasts():
         return []
 
 
-def generate_audio(podcast):
+def normalize_text(text):
+    """
+    Нормализация текста перед хэшированием: Unicode NFC и схлопывание пробелов.
+    
+    Args:
+        text: исходный текст
+    Returns:
+        нормализованный текст
+    """
+    text = unicodedata.normalize('NFC', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def audio_cache_key(text, backend=None):
+    """
+    Ключ аудиокэша: хэш нормализованного текста и параметров голоса.
+    Одинаковый текст с одинаковым голосом всегда даёт один и тот же файл,
+    независимо от id подкаста.
+    
+    Args:
+        text: текст для озвучки
+        backend: движок озвучки (по умолчанию текущий)
+    Returns:
+        hex-строка ключа
+    """
+    backend = backend or get_backend()
+    payload = f"{backend.voice_id}\n{normalize_text(text)}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:20]
+
+
+def read_podcast_text(podcast, from_files=True):
+    """
+    Текст для озвучки: из texts/podcast_{id}.txt, иначе из заголовка и описания.
+    
+    Args:
+        podcast: словарь с данными подкаста
+        from_files: читать ли texts/ (False — только данные в памяти)
+    Returns:
+        текст (может быть пустым)
+    """
+    text_file = os.path.join(TEXTS_DIR, f"podcast_{podcast['id']}.txt")
+    
+    if from_files and os.path.exists(text_file):
+        with open(text_file, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    
+    # Формируем текст из данных подкаста
+    return f"{podcast['title']}. {podcast.get('description', '')}".strip()
+
+
+def generate_audio(podcast, from_files=True):
     """
     Генерация аудиофайла из текста подкаста.
+    Файл называется по хэшу текста (audio/<ключ>.mp3), поэтому
+    повторяющиеся между запусками новости не озвучиваются заново.
     
     Args:
         podcast: словарь с данными подкаста
+        from_files: читать ли текст из texts/
     Returns:
         путь к аудиофайлу или None при ошибке
     """
     podcast_id = podcast['id']
-    text_file = os.path.join(TEXTS_DIR, f'podcast_{podcast_id}.txt')
-    audio_file = os.path.join(AUDIO_DIR, f'podcast_{podcast_id}.mp3')
-    
-    # Проверяем, есть ли уже аудио
-    if os.path.exists(audio_file):
-        logger.info(f"  Аудио уже существует: podcast_{podcast_id}.mp3")
-        return f"audio/podcast_{podcast_id}.mp3"
     
     # Читаем текст
     try:
-        if os.path.exists(text_file):
-            with open(text_file, 'r', encoding='utf-8') as f:
-                text = f.read().strip()
-        else:
-            # Формируем текст из данных подкаста
-            text = f"{podcast['title']}. {podcast.get('description', '')}"
+        text = read_podcast_text(podcast, from_files)
         
         if not text:
             logger.warning(f"  Пустой текст для podcast_{podcast_id}")
@@ -84,52 +203,261 @@ def generate_audio(podcast):
         logger.error(f"  Ошибка чтения текста podcast_{podcast_id}: {e}")
         return None
     
-    # Генерируем аудио через gTTS
+    audio_name = f"{audio_cache_key(text)}.mp3"
+    
+    with _audio_lock(audio_name):
+        return _synthesize(podcast, text, audio_name)
+
+
+def _synthesize(podcast, text, audio_name):
+    """
+    Озвучка текста в audio/<audio_name>, если файла ещё нет.
+    
+    Args:
+        podcast: словарь с данными подкаста
+        text: текст для озвучки
+        audio_name: имя файла в AUDIO_DIR
+    Returns:
+        путь к аудиофайлу или None при ошибке
+    """
+    podcast_id = podcast['id']
+    audio_file = os.path.join(AUDIO_DIR, audio_name)
+    
+    # Проверяем, есть ли уже целое аудио для этого текста
+    if atomic_io.verify_checksum(audio_file):
+        logger.info(f"  Аудио уже в кэше: podcast_{podcast_id} → {audio_name}")
+        metrics.record_tts(0, len(text), cached=True)
+        return f"audio/{audio_name}"
+    
+    # Генерируем аудио выбранным движком (временные ошибки повторяются)
     try:
         logger.info(f"  Озвучиваю: {podcast['title'][:50]}...")
+        started = time.perf_counter()
+        
+        backend = get_backend()
+        # Движок пишет во временный файл: под именем из кэша появляется только целый MP3
+        with atomic_io.atomic_path(audio_file) as temp_file:
+            # Лимит хоста считается в запросах: gTTS делает по запросу на кусок текста
+            cost = getattr(backend, 'request_count', lambda text: 1)(text)
+            resilience.call(
+                getattr(backend, 'host', None), backend.synthesize, text, temp_file, cost=cost
+            )
+        atomic_io.write_checksum(audio_file)
         
-        tts = gTTS(
-            text=text,
-            lang='ru',      # Русский язык
-            slow=False       # Нормальная скорость
-        )
-        tts.save(audio_file)
+        elapsed = time.perf_counter() - started
+        metrics.record_tts(elapsed, len(text))
+        metrics.add_stage('generate_audio', elapsed)
         
         # Проверяем размер файла
         size_kb = os.path.getsize(audio_file) / 1024
-        logger.info(f"  ✓ Сохранено: podcast_{podcast_id}.mp3 ({size_kb:.1f} KB)")
+        logger.info(f"  ✓ Сохранено: podcast_{podcast_id} → {audio_name} ({size_kb:.1f} KB)")
         
-        return f"audio/podcast_{podcast_id}.mp3"
+        return f"audio/{audio_name}"
         
     except Exception as e:
         logger.error(f"  ✗ Ошибка озвучки podcast_{podcast_id}: {e}")
         return None
 
 
+def describe_audio(podcast):
+    """
+    Сведения об аудио подкаста по заголовкам MP3-кадров:
+    длительность, размер, битрейт и хэш (поля mp3_probe.FIELDS).
+    Без аудио поля удаляются.
+    
+    Args:
+        podcast: словарь с данными подкаста (изменяется на месте)
+    """
+    for field in mp3_probe.FIELDS:
+        podcast.pop(field, None)
+    if not podcast.get('audio'):
+        return
+    try:
+        podcast.update(mp3_probe.probe(os.path.join(BASE_DIR, podcast['audio'])))
+    except OSError as e:
+        logger.warning(f"  Не удалось прочитать {podcast['audio']}: {e}")
+
+
+def is_audio_current(podcast, from_files=True):
+    """
+    Проверка, что у подкаста уже есть актуальное аудио:
+    путь совпадает с ключом кэша для текущего текста, а файл цел
+    (совпадает сохранённая контрольная сумма).
+    
+    Args:
+        podcast: словарь с данными подкаста
+        from_files: читать ли текст из texts/
+    Returns:
+        True, если озвучка не нужна
+    """
+    audio = podcast.get('audio')
+    if not audio:
+        return False
+    
+    try:
+        text = read_podcast_text(podcast, from_files)
+    except Exception:
+        return False
+    
+    return (
+        audio == f"audio/{audio_cache_key(text)}.mp3"
+        and atomic_io.verify_checksum(os.path.join(BASE_DIR, audio))
+    )
+
+
+def collect_garbage_audio(podcasts):
+    """
+    Удаление аудиофайлов, на которые не ссылается ни один подкаст
+    и ни одна статья архива (части архива и поисковый индекс
+    публикуют их ссылки), их контрольных сумм и остатков прерванной записи.
+    
+    Args:
+        podcasts: актуальный список подкастов
+    Returns:
+        количество удалённых файлов
+    """
+    referenced = {podcast.get('audio') for podcast in podcasts if podcast.get('audio')}
+    with ArticleStore(ARTICLE_STORE_FILE) as store:
+        referenced |= store.audio_paths()
+    removed = 0
+    
+    for filename in os.listdir(AUDIO_DIR):
+        path = os.path.join(AUDIO_DIR, filename)
+        if filename.endswith(atomic_io.TEMP_SUFFIX):
+            os.remove(path)
+            continue
+        
+        audio_name = filename
+        if filename.endswith(atomic_io.CHECKSUM_SUFFIX):
+            audio_name = filename[:-len(atomic_io.CHECKSUM_SUFFIX)]
+        if not audio_name.endswith('.mp3') or f"audio/{audio_name}" in referenced:
+            continue
+        os.remove(path)
+        if filename == audio_name:
+            removed += 1
+    
+    logger.info(f"Удалено неиспользуемых аудиофайлов: {removed}")
+    return removed
+
+
+@metrics.timed('update_podcasts_json')
 def update_podcasts_json(podcasts):
     """
-    Обновление podcasts.json с путями к аудиофайлам.
+    Обновление путей к аудио в базе статей (по строке на подкаст)
+    и выгрузка из неё podcasts.json и затронутых частей архива.
     
     Args:
         podcasts: обновлённый список подкастов
     """
-    with open(PODCASTS_JSON, 'w', encoding='utf-8') as f:
-        json.dump(podcasts, f, ensure_ascii=False, indent=2)
+    with ArticleStore(ARTICLE_STORE_FILE) as store:
+        updated = [store.set_audio(article_key(p), p.get('audio', ''), p) for p in podcasts]
+        # podcasts.json без записи в базе (создан до её появления) — заводим выпуск
+        if not all(updated):
+            store.record_run(podcasts)
+        exported = store.export_podcasts()
+        exporter.export_static(store, BASE_DIR, months={p['date'][:7] for p in exported})
+    
+    precompress.write_json(PODCASTS_JSON, exported, 'podcasts.json')
     
     logger.info(f"podcasts.json обновлён")
 
 
-def main():
+def generate_audio_safe(podcast, from_files=True):
+    """
+    Обёртка над generate_audio для пула потоков:
+    ошибка одного подкаста не роняет остальные.
+    
+    Args:
+        podcast: словарь с данными подкаста
+        from_files: читать ли текст из texts/
+    Returns:
+        путь к аудиофайлу или None при ошибке
+    """
+    try:
+        return generate_audio(podcast, from_files)
+    except Exception as e:
+        logger.error(f"  ✗ Непредвиденная ошибка podcast_{podcast.get('id')}: {e}")
+        return None
+
+
+def generate_all_audio(podcasts, workers=TTS_WORKERS, from_files=True):
+    """
+    Озвучка списка подкастов в пуле потоков.
+    Результаты возвращаются в том же порядке, что и подкасты.
+    
+    Args:
+        podcasts: список подкастов
+        workers: размер пула (1 — последовательно)
+        from_files: читать ли текст из texts/
+    Returns:
+        список путей к аудио (None для ошибок)
+    """
+    generate = functools.partial(generate_audio_safe, from_files=from_files)
+    
+    if workers <= 1:
+        return [generate(podcast) for podcast in podcasts]
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tts') as pool:
+        return list(pool.map(generate, podcasts))
+
+
+def voice_podcasts(podcasts, workers=TTS_WORKERS, incremental=False, from_files=True):
+    """
+    Озвучка подкастов с записью путей к аудио в поле audio
+    и сведений об аудио (длительность, размер, битрейт, хэш).
+    
+    Args:
+        podcasts: список подкастов (изменяется на месте)
+        workers: сколько подкастов озвучивать одновременно
+        incremental: озвучивать только новые/изменившиеся подкасты
+        from_files: читать ли текст из texts/
+    Returns:
+        кортеж (успешно, ошибок)
+    """
+    os.makedirs(AUDIO_DIR, exist_ok=True)
+    
+    success_count = 0
+    error_count = 0
+    
+    pending = podcasts
+    if incremental:
+        pending = [
+            podcast for podcast in podcasts
+            if not is_audio_current(podcast, from_files)
+        ]
+        success_count = len(podcasts) - len(pending)
+        logger.info(f"Инкрементально: {len(pending)} к озвучке, {success_count} без изменений")
+    
+    audio_paths = generate_all_audio(pending, workers, from_files)
+    
+    for podcast, audio_path in zip(pending, audio_paths):
+        if audio_path:
+            podcast['audio'] = audio_path
+            success_count += 1
+        else:
+            podcast['audio'] = ""
+            error_count += 1
+    
+    with metrics.timer('probe_audio', len(podcasts)):
+        for podcast in podcasts:
+            describe_audio(podcast)
+    
+    return success_count, error_count
+
+
+def main(workers=TTS_WORKERS, incremental=False):
     """
     Главная функция: озвучка всех подкастов.
+    
+    Args:
+        workers: сколько подкастов озвучивать одновременно
+        incremental: озвучивать только новые/изменившиеся подкасты
+                     и удалять аудио, на которое никто не ссылается
     """
     logger.info("=" * 50)
     logger.info("GameNews TTS — Генерация аудио")
     logger.info("=" * 50)
     
-    # Создаём папку для аудио
-    os.makedirs(AUDIO_DIR, exist_ok=True)
-    
     # Загружаем подкасты
     podcasts = load_podcasts()
     if not podcasts:
@@ -137,26 +465,48 @@ def main():
         return
     
     # Озвучиваем каждый подкаст
-    success_count = 0
-    error_count = 0
-    
-    for podcast in podcasts:
-        audio_path = generate_audio(podcast)
-        if audio_path:
-            podcast['audio'] = audio_path
-            success_count += 1
-        else:
-            error_count += 1
+    success_count, error_count = voice_podcasts(podcasts, workers, incremental)
     
     # Сохраняем обновлённый JSON
     update_podcasts_json(podcasts)
     
+    if incremental:
+        collect_garbage_audio(podcasts)
+    
+    # Дополняем отчёт rss_parser.py этапом озвучки
+    metrics.write_report(RUN_REPORT_FILE, merge=True)
+    
     # Итоги
     logger.info(f"\n{'=' * 50}")
     logger.info(f"ИТОГО: {success_count} озвучено, {error_count} ошибок")
     logger.info(f"{'=' * 50}")
 
 
+def parse_args():
+    """
+    Разбор аргументов командной строки.
+    
+    Returns:
+        argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description='GameNews — озвучка подкастов')
+    parser.add_argument(
+        '--workers', type=int, default=TTS_WORKERS,
+        help='сколько подкастов озвучивать одновременно (1 — последовательно)'
+    )
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help='озвучить только новые новости и удалить неиспользуемое аудио'
+    )
+    parser.add_argument(
+        '--backend', choices=sorted(tts_backends.BACKENDS), default=TTS_BACKEND,
+        help='движок озвучки'
+    )
+    return parser.parse_args()
+
+
 # === ЗАПУСК ===
 if __name__ == '__main__':
-    main()
+    args = parse_args()
+    set_backend(args.backend)
+    main(workers=args.workers, incremental=args.incremental)
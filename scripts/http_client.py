@@ -0,0 +1,171 @@
+"""
+GameNews — Общий HTTP-клиент с пулом соединений
+Все фиды качаются через один клиент: соединения с хостом (TCP + TLS)
+переиспользуются между запросами (keep-alive), поэтому рукопожатие
+с rss.stopgame.ru или www.goha.ru оплачивается один раз за запуск.
+
+По умолчанию используется requests.Session (HTTP/1.1). Если включён HTTP2
+и установлен httpx[http2], запросы идут через httpx.Client с HTTP/2 —
+тогда все фиды хоста мультиплексируются в одном соединении.
+
+Автор: GameNews Team
+"""
+
+import logging
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger('GameNews_HTTP')
+
+# HTTP/2 через httpx (pip install "httpx[http2]"); без него — HTTP/1.1
+HTTP2 = os.environ.get('GAMENEWS_HTTP2', '') == '1'
+
+# Сколько соединений держать открытыми на один хост
+POOL_SIZE = 10
+
+_client = None
+_client_guard = threading.Lock()
+
+
+class HTTPStatusError(requests.HTTPError):
+    """Сервер ответил кодом ошибки (status — HTTP-статус)."""
+
+    def __init__(self, status, url):
+        super().__init__(f"HTTP {status} для {url}")
+        self.status = status
+
+
+class Response:
+    """
+    Ответ сервера с единым интерфейсом для requests и httpx.
+    Тело читается лениво; gzip/deflate распаковываются клиентом.
+    """
+
+    def __init__(self, status, headers, chunks, read, close):
+        self.status = status
+        self.headers = headers
+        self._chunks = chunks
+        self._read = read
+        self._close = close
+
+    def iter_chunks(self, size):
+        """
+        Итератор распакованных кусков тела (bytes).
+        """
+        return self._chunks(size)
+
+    def read(self):
+        """
+        Тело ответа целиком (bytes).
+        """
+        return self._read()
+
+    def close(self):
+        self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _RequestsClient:
+    """HTTP/1.1 с keep-alive через requests.Session."""
+
+    def __init__(self, pool_size):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url, headers, timeout):
+        response = self.session.get(url, headers=headers, timeout=timeout, stream=True)
+        return Response(
+            response.status_code,
+            response.headers,
+            lambda size: response.iter_content(chunk_size=size),
+            lambda: response.content,
+            response.close
+        )
+
+    def close(self):
+        self.session.close()
+
+
+class _HttpxClient:
+    """HTTP/2 через httpx.Client."""
+
+    def __init__(self, pool_size):
+        import httpx
+        self.client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+
+    def get(self, url, headers, timeout):
+        import httpx
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        request = self.client.build_request('GET', url, headers=headers, timeout=timeout)
+        response = self.client.send(request, stream=True)
+        return Response(
+            response.status_code,
+            response.headers,
+            lambda size: response.iter_bytes(chunk_size=size),
+            response.read,
+            response.close
+        )
+
+    def close(self):
+        self.client.close()
+
+
+def get_client():
+    """
+    Общий клиент процесса (создаётся при первом обращении).
+
+    Returns:
+        клиент с методом get(url, headers, timeout) → Response
+    """
+    global _client
+    with _client_guard:
+        if _client is None:
+            if HTTP2:
+                try:
+                    _client = _HttpxClient(POOL_SIZE)
+                except ImportError:
+                    logger.warning("httpx[http2] не установлен, использую HTTP/1.1")
+            if _client is None:
+                _client = _RequestsClient(POOL_SIZE)
+        return _client
+
+
+def close_client():
+    """
+    Закрытие общего клиента и всех его соединений.
+    """
+    global _client
+    with _client_guard:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def get(url, headers=None, timeout=None):
+    """
+    GET-запрос через общий клиент. Тело не читается до обращения к нему,
+    поэтому ответ можно разбирать потоком и закрыть досрочно.
+
+    Args:
+        url: адрес
+        headers: дополнительные заголовки
+        timeout: таймаут в секундах или кортеж (connect, read)
+    Returns:
+        Response (ответ нужно закрыть — он поддерживает with)
+    """
+    return get_client().get(url, headers or {}, timeout)
@@ -0,0 +1,223 @@
+"""
+GameNews — Метрики запуска
+Замеры времени по этапам (загрузка фидов, очистка HTML, дедупликация,
+озвучка, запись JSON), размеры выгруженных файлов
+и отчёт run_report.json рядом с podcasts.json.
+
+Автор: GameNews Team
+"""
+
+import functools
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import atomic_io
+
+logger = logging.getLogger('GameNews_Metrics')
+
+_lock = threading.Lock()
+_state = {}
+
+
+def reset():
+    """
+    Сброс всех накопленных метрик (начало нового запуска).
+    """
+    with _lock:
+        _state.clear()
+        _state.update({
+            "started_at": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "started": time.perf_counter(),
+            "stages": {},
+            "feeds": [],
+            "tts": {"synthesized": 0, "cached": 0, "chars": 0, "seconds": 0.0},
+            "assets": {},
+        })
+
+
+reset()
+
+
+def add_stage(stage, seconds, items=1):
+    """
+    Учёт одного вызова этапа.
+
+    Args:
+        stage: название этапа
+        seconds: длительность вызова
+        items: сколько элементов обработано за вызов
+    """
+    with _lock:
+        entry = _state['stages'].setdefault(
+            stage, {"calls": 0, "items": 0, "seconds": 0.0}
+        )
+        entry['calls'] += 1
+        entry['items'] += items
+        entry['seconds'] += seconds
+
+
+@contextmanager
+def timer(stage, items=1):
+    """
+    Контекстный менеджер для замера участка кода.
+
+    Args:
+        stage: название этапа
+        items: сколько элементов обрабатывает участок
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_stage(stage, time.perf_counter() - started, items)
+
+
+def timed(stage):
+    """
+    Декоратор: замер каждого вызова функции как этапа stage.
+    Если первый аргумент — список, его длина считается числом элементов.
+
+    Args:
+        stage: название этапа
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            items = len(args[0]) if args and isinstance(args[0], list) else 1
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                add_stage(stage, time.perf_counter() - started, items)
+        return wrapper
+    return decorator
+
+
+def record_feed(name, url, seconds, size=None, entries=0, status=None):
+    """
+    Учёт загрузки одного фида.
+
+    Args:
+        name: название источника
+        url: адрес фида
+        seconds: время загрузки и разбора
+        size: скачано байт (None, если неизвестно)
+        entries: сколько новостей получено
+        status: HTTP-статус ответа
+    """
+    with _lock:
+        _state['feeds'].append({
+            "name": name,
+            "url": url,
+            "status": status,
+            "seconds": round(seconds, 4),
+            "bytes": size,
+            "entries": entries,
+        })
+    add_stage('fetch_feed', seconds, entries)
+
+
+def record_tts(seconds, chars, cached=False):
+    """
+    Учёт озвучки одного текста.
+
+    Args:
+        seconds: время синтеза
+        chars: длина текста в символах
+        cached: аудио взято из кэша без синтеза
+    """
+    with _lock:
+        tts = _state['tts']
+        if cached:
+            tts['cached'] += 1
+            return
+        tts['synthesized'] += 1
+        tts['chars'] += chars
+        tts['seconds'] += seconds
+
+
+def record_asset(name, sizes):
+    """
+    Учёт выгруженного файла и его сжатых копий.
+
+    Args:
+        name: путь файла относительно сайта
+        sizes: словарь {bytes, gzip, brotli} (brotli — None, если не сжимался)
+    """
+    with _lock:
+        _state['assets'][name] = dict(sizes)
+
+
+def build_report():
+    """
+    Сборка отчёта из накопленных метрик.
+
+    Returns:
+        словарь отчёта
+    """
+    with _lock:
+        stages = {}
+        for stage, entry in _state['stages'].items():
+            seconds = entry['seconds']
+            stages[stage] = {
+                "calls": entry['calls'],
+                "items": entry['items'],
+                "seconds": round(seconds, 4),
+                "avg_ms": round(seconds * 1000 / entry['calls'], 3) if entry['calls'] else 0,
+                "items_per_sec": round(entry['items'] / seconds, 1) if seconds else None,
+            }
+
+        tts = dict(_state['tts'])
+        tts['seconds'] = round(tts['seconds'], 3)
+        tts['sec_per_char'] = (
+            round(tts['seconds'] / tts['chars'], 6) if tts['chars'] else None
+        )
+
+        return {
+            "started_at": _state['started_at'],
+            "finished_at": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "wall_seconds": round(time.perf_counter() - _state['started'], 3),
+            "stages": stages,
+            "feeds": list(_state['feeds']),
+            "tts": tts,
+            "assets": dict(_state['assets']),
+        }
+
+
+def write_report(path, merge=False):
+    """
+    Запись отчёта в JSON.
+
+    Args:
+        path: путь к run_report.json
+        merge: дополнить существующий отчёт (второй скрипт того же запуска)
+    Returns:
+        записанный отчёт
+    """
+    report = build_report()
+
+    if merge:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+            previous['stages'].update(report['stages'])
+            previous.setdefault('assets', {}).update(report['assets'])
+            previous['feeds'] = previous.get('feeds') or report['feeds']
+            if report['tts']['synthesized'] or report['tts']['cached']:
+                previous['tts'] = report['tts']
+            previous['finished_at'] = report['finished_at']
+            previous['wall_seconds'] = round(
+                previous.get('wall_seconds', 0) + report['wall_seconds'], 3
+            )
+            report = previous
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+
+    atomic_io.write_json(path, report, indent=2)
+
+    logger.info(f"Отчёт о запуске сохранён в {path}")
+    return report
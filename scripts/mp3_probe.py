@@ -0,0 +1,117 @@
+"""
+GameNews — Сведения об MP3 без декодирования
+Длительность считается по заголовкам MPEG-кадров: из 4-байтового
+заголовка известны битрейт, частота и длина кадра, поэтому файл
+проходится прыжками от кадра к кадру без распаковки звука.
+Так сайт показывает длительность выпуска, не запрашивая аудио.
+
+Автор: GameNews Team
+"""
+
+import hashlib
+
+# Поля сведений об аудио в записи подкаста
+FIELDS = ('duration_sec', 'bytes', 'bitrate', 'sha256')
+
+# Битрейты (кбит/с) по индексу: [MPEG-1 / MPEG-2 и 2.5][слой I, II, III]
+_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# Частоты дискретизации (Гц) по версии MPEG (биты версии заголовка)
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),   # MPEG-1
+    2: (22050, 24000, 16000),   # MPEG-2
+    0: (11025, 12000, 8000),    # MPEG-2.5
+}
+
+
+def parse_frame_header(data, offset):
+    """
+    Разбор заголовка MPEG-кадра.
+
+    Args:
+        data: содержимое файла
+        offset: смещение предполагаемого заголовка
+    Returns:
+        (длина кадра в байтах, сэмплов в кадре, частота, битрейт кбит/с)
+        или None, если по смещению нет корректного заголовка
+    """
+    if offset + 4 > len(data):
+        return None
+    b1, b2 = data[offset + 1], data[offset + 2]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x3
+    layer = 4 - ((b1 >> 1) & 0x3)
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x3
+    padding = (b2 >> 1) & 0x1
+    if version_bits == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version_bits == 3
+    bitrate = _BITRATES[(1 if mpeg1 else 2, layer)][bitrate_index]
+    sample_rate = _SAMPLE_RATES[version_bits][rate_index]
+
+    if layer == 1:
+        return (12 * bitrate * 1000 // sample_rate + padding) * 4, 384, sample_rate, bitrate
+    samples = 1152 if layer == 2 or mpeg1 else 576
+    length = samples // 8 * bitrate * 1000 // sample_rate + padding
+    return length, samples, sample_rate, bitrate
+
+
+def _skip_id3v2(data):
+    """
+    Смещение первого кадра после тега ID3v2 (0, если тега нет).
+    """
+    if len(data) < 10 or data[:3] != b'ID3':
+        return 0
+    # Размер тега — 4 байта по 7 бит (synchsafe), плюс подвал, если он есть
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def probe(path):
+    """
+    Сведения об MP3-файле.
+
+    Args:
+        path: путь к файлу
+    Returns:
+        словарь {duration_sec, bytes, bitrate (средний, кбит/с), sha256}
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    offset = _skip_id3v2(data)
+    duration = 0.0
+    audio_bytes = 0
+    while offset < len(data):
+        header = parse_frame_header(data, offset)
+        if header is None:
+            # Мусор между кадрами или тег в конце: ищем следующую синхронизацию
+            offset = data.find(b'\xff', offset + 1)
+            if offset < 0:
+                break
+            continue
+        length, samples, sample_rate, _ = header
+        duration += samples / sample_rate
+        audio_bytes += min(length, len(data) - offset)
+        offset += length
+
+    return {
+        "duration_sec": round(duration, 3),
+        "bytes": len(data),
+        "bitrate": round(audio_bytes * 8 / duration / 1000) if duration else None,
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
@@ -0,0 +1,280 @@
+"""
+GameNews — Единый конвейер
+Сбор новостей и озвучка в одном процессе: собранные подкасты передаются
+в TTS прямо в памяти, без промежуточных texts/ и повторного чтения podcasts.json.
+
+Автор: GameNews Team
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# === НАСТРОЙКА ЛОГИРОВАНИЯ ===
+# Настраиваем до импорта модулей: их basicConfig после этого ничего не меняет
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(message)s',
+    handlers=[
+        logging.FileHandler('pipeline.log', encoding='utf-8'),
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('GameNews_Pipeline')
+
+import http_client
+import metrics
+import rss_parser
+import generate_podcast
+
+
+def run_pipeline(concurrency=rss_parser.FETCH_CONCURRENCY,
+                 workers=generate_podcast.TTS_WORKERS,
+                 use_cache=True,
+                 incremental=False,
+                 save_texts=False,
+                 skip_seen=False):
+    """
+    Сбор новостей и озвучка за один проход.
+
+    Args:
+        concurrency: сколько фидов качать одновременно
+        workers: сколько подкастов озвучивать одновременно
+        use_cache: использовать условные запросы и кэш фидов
+        incremental: переиспользовать аудио прошлого запуска и удалить лишнее
+        save_texts: записать texts/ для отладки
+        skip_seen: отсеивать новости, опубликованные в прошлых запусках
+    Returns:
+        список подкастов с путями к аудио
+    """
+    podcasts = rss_parser.collect_all_news(
+        concurrency=concurrency, use_cache=use_cache, skip_seen=skip_seen
+    )
+    if not podcasts:
+        logger.error("Нет подкастов для озвучки. Завершаю.")
+        return []
+
+    if incremental:
+        rss_parser.carry_over_audio(podcasts, rss_parser.load_previous_podcasts())
+
+    if save_texts:
+        rss_parser.save_texts_for_tts(podcasts)
+
+    success_count, error_count = generate_podcast.voice_podcasts(
+        podcasts, workers, incremental, from_files=False
+    )
+
+    # Выпуск записывается в базу один раз — уже с путями к аудио
+    rss_parser.save_podcasts(podcasts)
+
+    if incremental:
+        generate_podcast.collect_garbage_audio(podcasts)
+
+    metrics.write_report(rss_parser.RUN_REPORT_FILE)
+
+    logger.info(f"\n{'=' * 50}")
+    logger.info(f"ИТОГО: {success_count} озвучено, {error_count} ошибок")
+    logger.info(f"{'=' * 50}")
+
+    return podcasts
+
+
+async def _stream_and_voice(concurrency, workers, use_cache, incremental, skip_seen):
+    """
+    Производитель/потребитель: категории приходят из stream_categories()
+    по мере готовности, и их подкасты сразу уходят в пул TTS, пока
+    остальные фиды ещё загружаются.
+
+    Args:
+        concurrency: сколько фидов качать одновременно
+        workers: размер пула TTS
+        use_cache: использовать условные запросы и кэш фидов
+        incremental: переиспользовать аудио прошлого запуска
+        skip_seen: отсеивать новости, опубликованные в прошлых запусках
+    Returns:
+        кортеж (подкасты по категориям, успешно, ошибок)
+    """
+    loop = asyncio.get_running_loop()
+    os.makedirs(generate_podcast.AUDIO_DIR, exist_ok=True)
+    cache = rss_parser.load_feed_cache() if use_cache else None
+    previous = rss_parser.load_previous_podcasts() if incremental else []
+    seen = rss_parser.open_seen_store(skip_seen)
+
+    by_category = {}
+    jobs = []
+    success_count = 0
+    error_count = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='tts') as pool:
+        async for category, top_news in rss_parser.stream_categories(concurrency, cache, seen):
+            # Временный id: окончательные номера раздаются после сбора всех категорий
+            podcasts = [
+                rss_parser.make_podcast(item, category, f"{category}-{n}")
+                for n, item in enumerate(top_news, 1)
+            ]
+            if incremental:
+                rss_parser.carry_over_audio(podcasts, previous)
+            by_category[category] = podcasts
+
+            for podcast in podcasts:
+                if incremental and generate_podcast.is_audio_current(podcast, from_files=False):
+                    success_count += 1
+                    continue
+                future = loop.run_in_executor(
+                    pool, generate_podcast.generate_audio_safe, podcast, False
+                )
+                jobs.append((podcast, future))
+
+        if cache is not None:
+            rss_parser.save_feed_cache(cache)
+        seen.close()
+        http_client.close_client()
+
+        for podcast, future in jobs:
+            audio_path = await future
+            if audio_path:
+                podcast['audio'] = audio_path
+                success_count += 1
+            else:
+                podcast['audio'] = ""
+                error_count += 1
+
+    all_podcasts = [podcast for podcasts in by_category.values() for podcast in podcasts]
+    with metrics.timer('probe_audio', len(all_podcasts)):
+        for podcast in all_podcasts:
+            generate_podcast.describe_audio(podcast)
+
+    return by_category, success_count, error_count
+
+
+def run_streaming_pipeline(concurrency=rss_parser.FETCH_CONCURRENCY,
+                           workers=generate_podcast.TTS_WORKERS,
+                           use_cache=True,
+                           incremental=False,
+                           skip_seen=False):
+    """
+    Конвейерный режим: озвучка начинается, как только готова первая
+    категория, поэтому общее время близко к max(загрузка, озвучка).
+
+    Args:
+        concurrency: сколько фидов качать одновременно
+        workers: сколько подкастов озвучивать одновременно
+        use_cache: использовать условные запросы и кэш фидов
+        incremental: переиспользовать аудио прошлого запуска и удалить лишнее
+        skip_seen: отсеивать новости, опубликованные в прошлых запусках
+    Returns:
+        список подкастов с путями к аудио
+    """
+    logger.info("=" * 50)
+    logger.info("GameNews — Конвейер: сбор и озвучка одновременно")
+    logger.info("=" * 50)
+
+    by_category, success_count, error_count = asyncio.run(
+        _stream_and_voice(concurrency, workers, use_cache, incremental, skip_seen)
+    )
+
+    # Порядок и номера — как в RSS_FEEDS, независимо от порядка готовности
+    podcasts = []
+    for category in rss_parser.RSS_FEEDS:
+        for podcast in by_category.get(category, []):
+            podcast['id'] = len(podcasts) + 1
+            podcasts.append(podcast)
+
+    if not podcasts:
+        logger.error("Нет подкастов для озвучки. Завершаю.")
+        return []
+
+    rss_parser.save_podcasts(podcasts)
+
+    if incremental:
+        generate_podcast.collect_garbage_audio(podcasts)
+
+    metrics.write_report(rss_parser.RUN_REPORT_FILE)
+
+    logger.info(f"\n{'=' * 50}")
+    logger.info(f"ИТОГО: {len(podcasts)} подкастов, {success_count} озвучено, {error_count} ошибок")
+    logger.info(f"{'=' * 50}")
+
+    return podcasts
+
+
+def parse_args():
+    """
+    Разбор аргументов командной строки.
+
+    Returns:
+        argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description='GameNews — сбор новостей и озвучка')
+    parser.add_argument(
+        '--concurrency', type=int, default=rss_parser.FETCH_CONCURRENCY,
+        help='сколько фидов качать одновременно (1 — последовательно)'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=generate_podcast.TTS_WORKERS,
+        help='сколько подкастов озвучивать одновременно (1 — последовательно)'
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help='не использовать ETag / Last-Modified и кэш фидов'
+    )
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help='озвучить только новые новости и удалить неиспользуемое аудио'
+    )
+    parser.add_argument(
+        '--save-texts', action='store_true',
+        help='записать тексты для озвучки в texts/ (отладка)'
+    )
+    parser.add_argument(
+        '--streaming', action='store_true',
+        help='начинать озвучку, пока остальные фиды ещё загружаются'
+    )
+    parser.add_argument(
+        '--skip-seen', action='store_true',
+        help='отсеивать новости, опубликованные в прошлых запусках'
+    )
+    parser.add_argument(
+        '--http2', action='store_true',
+        help='качать фиды по HTTP/2 (нужен httpx[http2])'
+    )
+    parser.add_argument(
+        '--no-stream-parse', action='store_true',
+        help='скачивать фиды целиком и разбирать feedparser'
+    )
+    parser.add_argument(
+        '--backend', choices=sorted(generate_podcast.tts_backends.BACKENDS),
+        default=generate_podcast.TTS_BACKEND,
+        help='движок озвучки'
+    )
+    return parser.parse_args()
+
+
+# === ЗАПУСК ===
+if __name__ == '__main__':
+    args = parse_args()
+    generate_podcast.set_backend(args.backend)
+    rss_parser.STREAM_PARSE = not args.no_stream_parse
+    http_client.HTTP2 = http_client.HTTP2 or args.http2
+    if args.streaming:
+        podcasts = run_streaming_pipeline(
+            concurrency=args.concurrency,
+            workers=args.workers,
+            use_cache=not args.no_cache,
+            incremental=args.incremental,
+            skip_seen=args.skip_seen
+        )
+        if args.save_texts:
+            rss_parser.save_texts_for_tts(podcasts)
+    else:
+        run_pipeline(
+            concurrency=args.concurrency,
+            workers=args.workers,
+            use_cache=not args.no_cache,
+            incremental=args.incremental,
+            save_texts=args.save_texts,
+            skip_seen=args.skip_seen
+        )
+    logger.info("Готово!")
@@ -0,0 +1,173 @@
+"""
+GameNews — Сжатые копии файлов сайта
+Рядом с каждым выгружаемым файлом кладутся заранее сжатые копии
+(<файл>.gz и <файл>.br), поэтому веб-сервер (nginx gzip_static /
+brotli_static, CDN) отдаёт их как есть и не сжимает файл на каждый запрос.
+JSON перед этим минифицируется.
+
+Файлы, которые меняются при каждой выгрузке (поисковый индекс),
+получают хэш содержимого в имени: search.<хэш>.json можно кэшировать
+навсегда, а новый индекс приходит под новым именем.
+
+Brotli ставится из requirements.txt; если модуля нет, пишется только .gz.
+Размеры файлов и их сжатых копий попадают в run_report.json.
+
+Автор: GameNews Team
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+
+import atomic_io
+import metrics
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger('GameNews_Precompress')
+
+# Максимальное сжатие: файлы сжимаются один раз при выгрузке
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Сколько hex-символов хэша попадает в имя файла
+HASH_LENGTH = 12
+
+GZIP_SUFFIX = '.gz'
+BROTLI_SUFFIX = '.br'
+
+
+def minify_json(data):
+    """
+    JSON без пробелов (кириллица без экранирования).
+
+    Returns:
+        bytes в UTF-8
+    """
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def hashed_name(name, payload):
+    """
+    Имя файла с хэшем содержимого: 'search.json' → 'search.<хэш>.json'.
+    """
+    base, ext = os.path.splitext(name)
+    return f"{base}.{hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]}{ext}"
+
+
+def has_siblings(path):
+    """
+    Есть ли у файла все сжатые копии, которые умеет писать этот запуск.
+    """
+    if not os.path.exists(path + GZIP_SUFFIX):
+        return False
+    return brotli is None or os.path.exists(path + BROTLI_SUFFIX)
+
+
+def write_siblings(path, payload, name=None):
+    """
+    Запись сжатых копий содержимого файла и учёт размеров в отчёте.
+
+    Args:
+        path: путь к исходному файлу
+        payload: его содержимое (bytes)
+        name: имя для отчёта (по умолчанию — имя файла)
+    Returns:
+        словарь размеров {bytes, gzip, brotli}
+    """
+    # mtime=0 — одинаковое содержимое даёт побайтно одинаковый .gz
+    compressed = gzip.compress(payload, compresslevel=GZIP_LEVEL, mtime=0)
+    atomic_io.write_bytes(path + GZIP_SUFFIX, compressed)
+    sizes = {"bytes": len(payload), "gzip": len(compressed), "brotli": None}
+
+    if brotli is not None:
+        compressed = brotli.compress(payload, quality=BROTLI_QUALITY)
+        atomic_io.write_bytes(path + BROTLI_SUFFIX, compressed)
+        sizes['brotli'] = len(compressed)
+    else:
+        # Старая .br от запуска с brotli отдавала бы устаревшее содержимое
+        try:
+            os.remove(path + BROTLI_SUFFIX)
+        except FileNotFoundError:
+            pass
+
+    metrics.record_asset(name or os.path.basename(path), sizes)
+    return sizes
+
+
+def write_asset(path, payload, name=None):
+    """
+    Атомарная запись файла вместе со сжатыми копиями.
+
+    Args:
+        path: путь к файлу
+        payload: содержимое (bytes)
+        name: имя для отчёта
+    Returns:
+        словарь размеров {bytes, gzip, brotli}
+    """
+    atomic_io.write_bytes(path, payload)
+    return write_siblings(path, payload, name)
+
+
+def write_json(path, data, name=None):
+    """
+    Запись минифицированного JSON со сжатыми копиями.
+    """
+    return write_asset(path, minify_json(data), name)
+
+
+def compress_file(path, name=None):
+    """
+    Сжатые копии уже лежащего файла (index.html); копии пишутся,
+    только если файл изменился или их ещё нет.
+
+    Returns:
+        словарь размеров или None, если файла нет или копии актуальны
+    """
+    try:
+        with open(path, 'rb') as f:
+            payload = f.read()
+    except FileNotFoundError:
+        return None
+    try:
+        with open(path + GZIP_SUFFIX, 'rb') as f:
+            if gzip.decompress(f.read()) == payload and has_siblings(path):
+                return None
+    except (OSError, EOFError):
+        pass
+    return write_siblings(path, payload, name)
+
+
+def remove_stale(directory, name, keep):
+    """
+    Удаление старых версий файла с хэшем в имени и их сжатых копий.
+
+    Args:
+        directory: папка файлов
+        name: имя без хэша ('search.json')
+        keep: имена версий, которые нужно оставить
+    Returns:
+        сколько файлов удалено
+    """
+    base, ext = os.path.splitext(name)
+    removed = 0
+    for filename in os.listdir(directory):
+        version = filename
+        for suffix in (GZIP_SUFFIX, BROTLI_SUFFIX):
+            if version.endswith(suffix):
+                version = version[:-len(suffix)]
+        if not (version.startswith(f"{base}.") and version.endswith(ext)) or version in keep:
+            continue
+        if len(version) != len(base) + 1 + HASH_LENGTH + len(ext):
+            continue
+        os.remove(os.path.join(directory, filename))
+        removed += 1
+    if removed:
+        logger.info(f"Удалено {removed} устаревших версий {name}")
+    return removed
@@ -0,0 +1,252 @@
+"""
+GameNews — Устойчивость сетевых вызовов
+Общий слой для загрузки фидов и озвучки: для каждого хоста свой
+ограничитель частоты (token bucket) и автомат-предохранитель
+(circuit breaker), временные ошибки повторяются с экспоненциальной
+задержкой и случайным разбросом (jitter). Число попыток и общий
+бюджет времени на вызов ограничены, поэтому один зависший хост
+не растягивает весь запуск.
+
+Автор: GameNews Team
+"""
+
+import logging
+import random
+import threading
+import time
+
+import requests
+
+logger = logging.getLogger('GameNews_Resilience')
+
+# Таймауты одного запроса: установка соединения и ожидание данных (секунды)
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 20
+TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+# Повторы: не больше MAX_RETRIES, задержка до BACKOFF_BASE * 2^попытка (не больше BACKOFF_CAP)
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+
+# Общий бюджет времени на вызов вместе с повторами
+CALL_DEADLINE = 60.0
+
+# Предохранитель: после FAILURE_THRESHOLD ошибок подряд хост отключается на RESET_TIMEOUT секунд
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 60.0
+
+# Частота запросов к хосту: (запросов в секунду, размер пачки).
+# Вызов, делающий несколько запросов (gTTS — по запросу на кусок текста),
+# берёт токен на каждый запрос (call(..., cost=n))
+DEFAULT_RATE = (5.0, 5)
+HOST_RATES = {
+    'translate.google.com': (2.0, 2),
+}
+
+# HTTP-статусы, после которых имеет смысл повторить запрос
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+_hosts = {}
+_hosts_guard = threading.Lock()
+
+
+class CircuitOpenError(RuntimeError):
+    """Хост временно отключён предохранителем — вызов не выполнялся."""
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты: rate запросов в секунду, пачкой не больше burst.
+    Потоки, которым не хватило токена, ждут своей очереди.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """
+        Взятие токенов (с ожиданием, если их нет).
+
+        Args:
+            tokens: сколько запросов оплачивается (может превышать burst —
+                    тогда ожидание растягивается на нужное время)
+        Returns:
+            сколько секунд пришлось ждать
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Токен резервируется сразу: следующий поток встанет в очередь за этим
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    """
+    Предохранитель: после threshold временных ошибок подряд вызовы
+    отклоняются сразу; через reset_timeout пропускается одна пробная попытка.
+    """
+
+    def __init__(self, threshold, reset_timeout):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Можно ли выполнять вызов сейчас.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        """
+        Учёт временной ошибки.
+
+        Returns:
+            True, если предохранитель только что сработал
+        """
+        with self._lock:
+            self._failures += 1
+            if self._trial or (self._opened_at is None and self._failures >= self.threshold):
+                self._opened_at = time.monotonic()
+                self._trial = False
+                return True
+            return False
+
+
+def _host_policy(host):
+    """
+    Ограничитель и предохранитель хоста (создаются при первом обращении).
+    """
+    with _hosts_guard:
+        policy = _hosts.get(host)
+        if policy is None:
+            rate, burst = HOST_RATES.get(host, DEFAULT_RATE)
+            policy = (TokenBucket(rate, burst), CircuitBreaker(FAILURE_THRESHOLD, RESET_TIMEOUT))
+            _hosts[host] = policy
+        return policy
+
+
+def reset():
+    """
+    Сброс состояния всех хостов (для тестов и бенчмарков).
+    """
+    with _hosts_guard:
+        _hosts.clear()
+
+
+def _status(error):
+    """
+    HTTP-статус из исключения requests / http_client / gTTS, если он есть.
+    """
+    status = getattr(error, 'status', None)
+    if status is not None:
+        return status
+    # Ответ requests с ошибкой ложен в bool, поэтому сравниваем с None
+    response = getattr(error, 'response', None)
+    if response is None:
+        response = getattr(error, 'rsp', None)
+    return getattr(response, 'status_code', None)
+
+
+def is_retryable(error):
+    """
+    Временная ли ошибка: обрыв или таймаут соединения, 429 или 5xx.
+    Обёрнутые исключения (например, gTTSError) проверяются по причине.
+
+    Args:
+        error: исключение
+    Returns:
+        True, если вызов стоит повторить
+    """
+    status = _status(error)
+    if status is not None:
+        return status in RETRY_STATUSES
+    if isinstance(error, (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError)):
+        return True
+    cause = error.__cause__ or error.__context__
+    return cause is not None and is_retryable(cause)
+
+
+def backoff(attempt):
+    """
+    Задержка перед повтором: «полный разброс» от 0 до BACKOFF_BASE * 2^attempt.
+    """
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+def call(host, func, *args, retries=None, deadline=None, cost=1, **kwargs):
+    """
+    Вызов func(*args, **kwargs) с учётом частоты, повторов и предохранителя хоста.
+
+    Args:
+        host: имя хоста (None — без ограничений и повторов)
+        func: функция, выполняющая запрос
+        retries: сколько раз повторять временные ошибки (по умолчанию MAX_RETRIES)
+        deadline: бюджет времени на все попытки (по умолчанию CALL_DEADLINE)
+        cost: сколько HTTP-запросов делает одна попытка (столько токенов
+              берётся перед каждой попыткой, включая повторы)
+    Returns:
+        результат func
+    Raises:
+        CircuitOpenError: хост отключён предохранителем
+        исключение последней попытки, если повторы не помогли
+    """
+    if host is None:
+        return func(*args, **kwargs)
+
+    retries = MAX_RETRIES if retries is None else retries
+    deadline = CALL_DEADLINE if deadline is None else deadline
+    bucket, breaker = _host_policy(host)
+    started = time.monotonic()
+    attempt = 0
+
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(f"{host} временно отключён после серии ошибок")
+        bucket.acquire(cost)
+
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if not is_retryable(e):
+                # Хост ответил (404, 403): он доступен, пробный вызов завершён
+                breaker.record_success()
+                raise
+            if breaker.record_failure():
+                logger.warning(f"Предохранитель: {host} отключён на {RESET_TIMEOUT:.0f} с")
+                raise
+            delay = backoff(attempt)
+            if attempt >= retries or time.monotonic() - started + delay > deadline:
+                raise
+            attempt += 1
+            logger.warning(f"  {host}: {e} — повтор {attempt}/{retries} через {delay:.1f} с")
+            time.sleep(delay)
+            continue
+
+        breaker.record_success()
+        return result
@@ -12,13 +12,32 @@ GameNews — RSS Parser
 """
 
 import feedparser
+import asyncio
+import argparse
+import calendar
+import functools
 import json
 import os
 import re
 import logging
-from datetime import datetime, timedelta
+import time
+import urllib.parse
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
 from html import unescape
 
+import atomic_io
+import dedup
+import exporter
+import feed_stream
+import http_client
+import metrics
+import precompress
+import resilience
+from article_store import ArticleStore
+from seen_store import SeenStore
+from topk import TopK
+
 # === НАСТРОЙКА ЛОГИРОВАНИЯ ===
 logging.basicConfig(
     level=logging.INFO,
@@ -74,13 +93,65 @@ RSS_FEEDS = {
 # Максимум новостей на категорию
 MAX_NEWS_PER_CATEGORY = 5
 
+# Запас отбора сверх MAX_NEWS_PER_CATEGORY на случай дубликатов среди лучших
+TOP_K_BUFFER = 5
+
+# Поиск почти-дубликатов (MinHash + LSH) по заголовку и описанию
+NEAR_DEDUP = True
+
+# Параллельная загрузка фидов: сколько запросов одновременно
+FETCH_CONCURRENCY = 6
+
+# Таймауты HTTP-запроса к фиду: (соединение, ожидание данных) в секундах
+FETCH_TIMEOUT = resilience.TIMEOUT
+
+# Потоковый разбор: читать фид кусками и прекращать загрузку,
+# как только набрано MAX_NEWS_PER_CATEGORY * 2 записей
+STREAM_PARSE = True
+STREAM_CHUNK_SIZE = 16 * 1024
+
 # Папка для результатов
 OUTPUT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+# Отчёт о запуске: время этапов, объём загрузки, скорость озвучки
+RUN_REPORT_FILE = os.path.join(OUTPUT_DIR, 'run_report.json')
+
+# База статей: история выпусков, из неё выгружается podcasts.json
+ARTICLE_STORE_FILE = os.path.join(OUTPUT_DIR, 'data', 'articles.sqlite')
+
+# Отпечатки опубликованных новостей (для отсева повторов между запусками)
+SEEN_STORE_FILE = os.path.join(OUTPUT_DIR, 'cache', 'seen.sqlite')
+
+# Кэш условных запросов: ETag / Last-Modified, последние новости и отметка каждого фида
+FEED_CACHE_FILE = os.path.join(OUTPUT_DIR, 'cache', 'feeds.json')
+
+
+# Один проход по тексту: блоки script/style, CDATA, теги и HTML-сущности.
+# Шаблон сущностей — тот же, что в html.unescape.
+_HTML_TOKEN = re.compile(
+    r'<(script|style)\b[^>]*>.*?</\1\s*>'
+    r'|<!\[CDATA\[.*?\]\]>'
+    r'|<[^>]+>'
+    r'|&(?:#[0-9]+;?|#[xX][0-9a-fA-F]+;?|[^\t\n\f <&#;]{1,32};?)',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Сущности в фидах повторяются (&laquo;, &nbsp;, ...) — декодируем каждую один раз
+_decode_entity = functools.lru_cache(maxsize=2048)(unescape)
+
+
+def _replace_html_token(match):
+    token = match.group()
+    return _decode_entity(token) if token[0] == '&' else ''
+
 
+@metrics.timed('clean_html')
 def clean_html(text):
     """
     Очистка HTML-тегов из текста.
+    Теги и сущности обрабатываются за один проход регулярного выражения,
+    пробелы схлопываются split/join; содержимое <script>, <style>
+    и CDATA отбрасывается. Текст без '<' и '&' только нормализуется.
     
     Args:
         text: строка с возможными HTML-тегами
@@ -89,13 +160,10 @@ def clean_html(text):
     """
     if not text:
         return ""
-    # Убираем HTML-теги
-    clean = re.sub(r'<[^>]+>', '', text)
-    # Декодируем HTML-сущности
-    clean = unescape(clean)
-    # Убираем лишние пробелы
-    clean = re.sub(r'\s+', ' ', clean).strip()
-    return clean
+    if '<' in text or '&' in text:
+        text = _HTML_TOKEN.sub(_replace_html_token, text)
+    # str.split() делит по тем же пробельным символам, что и \s
+    return ' '.join(text.split())
 
 
 def truncate_text(text, max_length=500):
@@ -149,6 +217,39 @@ def extract_image(entry):
     return ""
 
 
+def parse_timestamp(entry):
+    """
+    Точное время публикации записи.
+    
+    Args:
+        entry: объект записи feedparser
+    Returns:
+        секунды Unix-эпохи (UTC) или None, если дата не указана
+    """
+    for field in ('published_parsed', 'updated_parsed'):
+        parsed = entry.get(field)
+        if parsed:
+            try:
+                return calendar.timegm(parsed[:6])
+            except (TypeError, ValueError, OverflowError):
+                pass
+    return None
+
+
+def format_date(timestamp):
+    """
+    Дата для отображения по времени публикации.
+    
+    Args:
+        timestamp: секунды Unix-эпохи или None
+    Returns:
+        дата в формате YYYY-MM-DD (UTC); без времени публикации — сегодняшняя
+    """
+    if timestamp is None:
+        return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime('%Y-%m-%d')
+
+
 def parse_date(entry):
     """
     Извлечение и форматирование даты публикации.
@@ -158,82 +259,448 @@ def parse_date(entry):
     Returns:
         дата в формате YYYY-MM-DD
     """
-    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-        try:
-            dt = datetime(*entry.published_parsed[:6])
-            return dt.strftime('%Y-%m-%d')
-        except Exception:
-            pass
+    return format_date(parse_timestamp(entry))
+
+
+def entry_guid(entry):
+    """
+    Постоянный идентификатор записи: guid/id, а без него — ссылка.
+    """
+    return entry.get('id') or entry.get('link', '')
+
+
+def feed_watermark(news):
+    """
+    Отметка «до сих пор обработано»: самая свежая датированная новость фида.
+    
+    Args:
+        news: разобранные новости фида
+    Returns:
+        словарь {published, guid} или None, если датированных новостей нет
+    """
+    dated = [item for item in news if item.get('published') is not None]
+    if not dated:
+        return None
+    newest = max(dated, key=lambda item: item['published'])
+    return {"published": newest['published'], "guid": newest.get('guid', '')}
 
-    if hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-        try:
-            dt = datetime(*entry.updated_parsed[:6])
-            return dt.strftime('%Y-%m-%d')
-        except Exception:
-            pass
 
-    return datetime.now().strftime('%Y-%m-%d')
+def is_below_watermark(entry, watermark):
+    """
+    Обработана ли запись в прошлом запуске: она старше отметки
+    или это сама отмеченная запись. Записи без даты считаются новыми.
+    
+    Args:
+        entry: объект записи feedparser
+        watermark: словарь {published, guid}
+    Returns:
+        True, если запись уже обработана
+    """
+    published = parse_timestamp(entry)
+    if published is None:
+        return False
+    return published < watermark['published'] or entry_guid(entry) == watermark['guid']
 
 
-def fetch_feed(feed_config):
+def parse_feed(feed_config, feed, cached=None):
+    """
+    Разбор результата feedparser в список новостей.
+    Записи не новее отметки прошлого запуска не очищаются заново:
+    их новости берутся из кэша по guid, а отсутствующие в кэше
+    (не вошедшие в выборку прошлого запуска) пропускаются.
+    
+    Args:
+        feed_config: словарь с name, url, priority
+        feed: результат feedparser.parse()
+        cached: запись кэша фида {etag, modified, news, watermark} (необязательно)
+    Returns:
+        список новостей [{title, description, link, guid, image, published, date, source}]
+    """
+    name = feed_config['name']
+    
+    if feed.bozo and not feed.entries:
+        logger.warning(f"Ошибка парсинга {name}: {feed.bozo_exception}")
+        return []
+    
+    watermark = (cached or {}).get('watermark')
+    known = {item.get('guid'): item for item in cached['news']} if watermark else {}
+    reused = 0
+    
+    news = []
+    for entry in feed.entries[:MAX_NEWS_PER_CATEGORY * 2]:  # берём с запасом
+        if watermark and is_below_watermark(entry, watermark):
+            item = known.get(entry_guid(entry))
+            if item is not None:
+                news.append(item)
+                reused += 1
+            continue
+        
+        title = clean_html(entry.get('title', ''))
+        if not title:
+            continue
+            
+        description = clean_html(
+            entry.get('summary', entry.get('description', ''))
+        )
+        description = truncate_text(description)
+        published = parse_timestamp(entry)
+        
+        news_item = {
+            "title": title,
+            "description": description,
+            "link": entry.get('link', ''),
+            "guid": entry_guid(entry),
+            "image": extract_image(entry),
+            "published": published,
+            "date": format_date(published),
+            "source": name,
+            "priority": feed_config.get('priority', 1)
+        }
+        news.append(news_item)
+    
+    if reused:
+        logger.info(f"  → {name}: получено {len(news)} новостей, из них {reused} уже обработаны ранее")
+    else:
+        logger.info(f"  → {name}: получено {len(news)} новостей")
+    return news
+
+
+def load_feed_cache():
+    """
+    Загрузка кэша фидов (валидаторы и последние новости).
+    
+    Returns:
+        словарь {url: {etag, modified, news, watermark}} или пустой словарь
+    """
+    try:
+        with open(FEED_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (json.JSONDecodeError, OSError) as e:
+        logger.warning(f"Кэш фидов повреждён, начинаю заново: {e}")
+        return {}
+    
+    # Записи старого формата (без времени публикации) загружаются заново
+    return {
+        url: entry for url, entry in cache.items()
+        if all('published' in item for item in entry.get('news', []))
+    }
+
+
+@metrics.timed('save_feed_cache')
+def save_feed_cache(cache):
+    """
+    Сохранение кэша фидов.
+    
+    Args:
+        cache: словарь {url: {etag, modified, news, watermark}}
+    """
+    atomic_io.write_json(FEED_CACHE_FILE, cache)
+
+
+def remember_feed(cache, url, etag, modified, news):
+    """
+    Запоминание валидаторов, новостей и отметки фида после успешной загрузки.
+    
+    Args:
+        cache: словарь кэша фидов (изменяется на месте)
+        url: адрес фида
+        etag: значение ETag из ответа (или None)
+        modified: значение Last-Modified из ответа (или None)
+        news: разобранные новости фида
+    """
+    if cache is None or not news:
+        return
+    cache[url] = {
+        "etag": etag,
+        "modified": modified,
+        "news": news,
+        "watermark": feed_watermark(news)
+    }
+
+
+def feed_host(url):
+    """
+    Хост фида — ключ ограничителя частоты и предохранителя.
+    """
+    return urllib.parse.urlsplit(url).hostname
+
+
+def fetch_feed(feed_config, cache=None):
     """
     Загрузка и парсинг одного RSS-фида.
+    Если фид есть в кэше, запрос отправляется с If-None-Match /
+    If-Modified-Since, а на 304 возвращаются новости из кэша.
+    Временные ошибки повторяются с учётом ограничений хоста (resilience).
     
     Args:
         feed_config: словарь с name, url, priority
+        cache: словарь кэша фидов (необязательно)
     Returns:
-        список новостей [{title, description, link, image, date, source}]
+        список новостей [{title, description, link, image, published, date, source}]
     """
     url = feed_config['url']
     name = feed_config['name']
+    cached = (cache or {}).get(url)
     
     logger.info(f"Загружаю RSS: {name} ({url})")
+    started = time.perf_counter()
     
     try:
-        feed = feedparser.parse(url)
+        response = resilience.call(
+            feed_host(url),
+            download_feed,
+            url,
+            cached.get('etag') if cached else None,
+            cached.get('modified') if cached else None
+        )
+        status = response['status']
         
-        if feed.bozo and not feed.entries:
-            logger.warning(f"Ошибка парсинга {name}: {feed.bozo_exception}")
-            return []
+        if status == 304 and cached:
+            logger.info(f"  → {name}: не изменился, беру {len(cached['news'])} новостей из кэша")
+            metrics.record_feed(name, url, time.perf_counter() - started, 0, len(cached['news']), status)
+            return cached['news']
         
-        news = []
-        for entry in feed.entries[:MAX_NEWS_PER_CATEGORY * 2]:  # берём с запасом
-            title = clean_html(entry.get('title', ''))
-            if not title:
-                continue
-                
-            description = clean_html(
-                entry.get('summary', entry.get('description', ''))
-            )
-            description = truncate_text(description)
-            
-            news_item = {
-                "title": title,
-                "description": description,
-                "link": entry.get('link', ''),
-                "image": extract_image(entry),
-                "date": parse_date(entry),
-                "source": name
-            }
-            news.append(news_item)
+        feed = parse_feed_bytes(response['data'], response['headers'])
+        news = parse_feed(feed_config, feed, cached)
+        remember_feed(cache, url, response['etag'], response['modified'], news)
+        metrics.record_feed(name, url, time.perf_counter() - started, len(response['data']), len(news), status)
+        return news
         
-        logger.info(f"  → {name}: получено {len(news)} новостей")
+    except Exception as e:
+        logger.error(f"Ошибка загрузки {name}: {e}")
+        metrics.record_feed(name, url, time.perf_counter() - started)
+        return []
+
+
+def _open_feed(url, etag=None, modified=None):
+    """
+    Открытие HTTP-ответа фида с условными заголовками
+    через общий клиент с пулом соединений.
+    
+    Args:
+        url: адрес RSS-фида
+        etag: ETag прошлого ответа для If-None-Match
+        modified: Last-Modified прошлого ответа для If-Modified-Since
+    Returns:
+        открытый http_client.Response или None, если сервер ответил 304
+    Raises:
+        http_client.HTTPStatusError: сервер ответил ошибкой
+    """
+    headers = {'User-Agent': feedparser.USER_AGENT}
+    if etag:
+        headers['If-None-Match'] = etag
+    if modified:
+        headers['If-Modified-Since'] = modified
+    
+    response = http_client.get(
+        urllib.parse.quote(url, safe=":/?#[]@!$&'()*+,;=%"),
+        headers=headers,
+        timeout=FETCH_TIMEOUT
+    )
+    if response.status == 304:
+        response.close()
+        return None
+    if response.status >= 400:
+        response.close()
+        raise http_client.HTTPStatusError(response.status, url)
+    return response
+
+
+def download_feed(url, etag=None, modified=None):
+    """
+    Скачивание фида в виде байтов (без разбора).
+    Кириллица в пути URL экранируется, gzip распаковывается клиентом.
+    
+    Args:
+        url: адрес RSS-фида
+        etag: ETag прошлого ответа для If-None-Match
+        modified: Last-Modified прошлого ответа для If-Modified-Since
+    Returns:
+        словарь {status, data, headers, etag, modified}; на 304 data пустое
+    """
+    response = _open_feed(url, etag, modified)
+    if response is None:
+        return {"status": 304, "data": b"", "headers": {}, "etag": etag, "modified": modified}
+    
+    with response:
+        return {
+            "status": response.status,
+            "data": response.read(),
+            "headers": dict(response.headers),
+            "etag": response.headers.get('ETag'),
+            "modified": response.headers.get('Last-Modified')
+        }
+
+
+def parse_feed_bytes(data, headers=None):
+    """
+    Разбор скачанного фида feedparser.
+    Передаются байты, а не URL, чтобы feedparser не открывал своё соединение;
+    заголовки ответа нужны ему для определения кодировки.
+    
+    Args:
+        data: тело ответа
+        headers: заголовки ответа
+    Returns:
+        результат feedparser.parse()
+    """
+    response_headers = {
+        key.lower(): value for key, value in (headers or {}).items()
+        if key.lower() in ('content-type', 'content-location', 'content-language')
+    }
+    return feedparser.parse(data, response_headers=response_headers)
+
+
+def stream_feed(url, limit, etag=None, modified=None):
+    """
+    Потоковая загрузка фида: записи разбираются по мере чтения сокета,
+    соединение закрывается, как только набрано limit записей.
+    Если документ оказался некорректным XML, он дочитывается целиком
+    и разбирается feedparser (он терпимее к ошибкам разметки).
+    
+    Args:
+        url: адрес RSS-фида
+        limit: сколько записей нужно
+        etag: ETag прошлого ответа для If-None-Match
+        modified: Last-Modified прошлого ответа для If-Modified-Since
+    Returns:
+        словарь {status, feed, bytes, etag, modified};
+        feed — результат в формате feedparser (None на 304)
+    """
+    response = _open_feed(url, etag, modified)
+    if response is None:
+        return {"status": 304, "feed": None, "bytes": 0, "etag": etag, "modified": modified}
+    
+    received = []
+    
+    with response:
+        body = iter(response.iter_chunks(STREAM_CHUNK_SIZE))
+        
+        def chunks():
+            for chunk in body:
+                received.append(chunk)
+                yield chunk
+        
+        try:
+            entries = list(feed_stream.iter_entries(chunks(), limit))
+            feed = feedparser.FeedParserDict(bozo=False, entries=entries)
+        except ET.ParseError as e:
+            logger.info(f"  Потоковый разбор {url} не удался ({e}), разбираю feedparser")
+            received.extend(body)
+            feed = parse_feed_bytes(b''.join(received), response.headers)
+        
+        return {
+            "status": response.status,
+            "feed": feed,
+            "bytes": sum(len(chunk) for chunk in received),
+            "etag": response.headers.get('ETag'),
+            "modified": response.headers.get('Last-Modified')
+        }
+
+
+async def fetch_feed_async(feed_config, semaphore, cache=None):
+    """
+    Асинхронная загрузка одного фида.
+    Скачивание идёт в отдельном потоке под семафором,
+    разбор байтов — общим parse_feed().
+    
+    Args:
+        feed_config: словарь с name, url, priority
+        semaphore: asyncio.Semaphore, ограничивающий число запросов
+        cache: словарь кэша фидов (необязательно)
+    Returns:
+        список новостей [{title, description, link, image, published, date, source}]
+    """
+    url = feed_config['url']
+    name = feed_config['name']
+    cached = (cache or {}).get(url)
+    
+    started = time.perf_counter()
+    try:
+        async with semaphore:
+            logger.info(f"Загружаю RSS: {name} ({url})")
+            started = time.perf_counter()
+            etag = cached.get('etag') if cached else None
+            modified = cached.get('modified') if cached else None
+            if STREAM_PARSE:
+                response = await asyncio.to_thread(
+                    resilience.call, feed_host(url),
+                    stream_feed, url, MAX_NEWS_PER_CATEGORY * 2, etag, modified
+                )
+                size = response['bytes']
+            else:
+                response = await asyncio.to_thread(
+                    resilience.call, feed_host(url), download_feed, url, etag, modified
+                )
+                size = len(response['data'])
+        
+        status = response['status']
+        
+        if status == 304 and cached:
+            logger.info(f"  → {name}: не изменился, беру {len(cached['news'])} новостей из кэша")
+            metrics.record_feed(name, url, time.perf_counter() - started, size, len(cached['news']), status)
+            return cached['news']
+        
+        if STREAM_PARSE:
+            feed = response['feed'] or feedparser.FeedParserDict(bozo=False, entries=[])
+        else:
+            feed = parse_feed_bytes(response['data'], response['headers'])
+        news = parse_feed(feed_config, feed, cached)
+        remember_feed(cache, url, response['etag'], response['modified'], news)
+        metrics.record_feed(name, url, time.perf_counter() - started, size, len(news), status)
         return news
         
     except Exception as e:
         logger.error(f"Ошибка загрузки {name}: {e}")
+        metrics.record_feed(name, url, time.perf_counter() - started)
         return []
 
 
-def remove_duplicates(news_list):
+async def fetch_all_feeds(concurrency=FETCH_CONCURRENCY, cache=None):
+    """
+    Параллельная загрузка всех фидов из RSS_FEEDS.
+    Время работы определяется самым медленным фидом, а не суммой.
+    
+    Args:
+        concurrency: максимум одновременных запросов
+        cache: словарь кэша фидов (необязательно)
+    Returns:
+        словарь {категория: [список новостей каждого фида]} в порядке RSS_FEEDS
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    tasks = {
+        category: [fetch_feed_async(feed_config, semaphore, cache) for feed_config in feeds]
+        for category, feeds in RSS_FEEDS.items()
+    }
+    flat = [task for category_tasks in tasks.values() for task in category_tasks]
+    results = iter(await asyncio.gather(*flat))
+    
+    return {
+        category: [next(results) for _ in category_tasks]
+        for category, category_tasks in tasks.items()
+    }
+
+
+@metrics.timed('remove_duplicates')
+def remove_duplicates(news_list, near=None):
     """
     Удаление дубликатов по заголовку (нечёткое сравнение).
+    В режиме near дополнительно убираются почти-дубликаты: из группы
+    похожих новостей остаётся копия источника с высшим приоритетом
+    (меньшее число priority), при равенстве — первая.
     
     Args:
         news_list: список новостей
+        near: искать почти-дубликаты (по умолчанию NEAR_DEDUP)
     Returns:
         список без дубликатов
     """
+    if near is None:
+        near = NEAR_DEDUP
+    
     seen_titles = set()
     unique = []
     
@@ -246,13 +713,192 @@ def remove_duplicates(news_list):
             seen_titles.add(normalized)
             unique.append(item)
     
-    return unique
+    if not near or len(unique) < 2:
+        return unique
+    
+    # Лучшая копия каждой группы: высший приоритет, затем порядок появления
+    best = {}
+    for index, group in enumerate(dedup.near_duplicate_groups(unique)):
+        current = best.get(group)
+        if current is None or unique[index].get('priority', 1) < unique[current].get('priority', 1):
+            best[group] = index
+    
+    keep = set(best.values())
+    return [item for index, item in enumerate(unique) if index in keep]
+
+
+def open_seen_store(skip_seen=False):
+    """
+    Хранилище опубликованных новостей для запуска.
+    
+    Args:
+        skip_seen: отсеивать и новости прошлых запусков (иначе — только
+                   повторы между категориями текущего запуска)
+    Returns:
+        SeenStore
+    """
+    return SeenStore(SEEN_STORE_FILE if skip_seen else ':memory:')
+
+
+def news_rank(item, position):
+    """
+    Ключ ранжирования новости: время публикации, затем приоритет источника
+    (меньшее число priority — выше), затем позиция в фиде (выше — свежее).
+    Новости без даты уступают всем датированным.
+    
+    Args:
+        item: новость
+        position: номер записи в своём фиде
+    Returns:
+        кортеж; больший ключ — лучше
+    """
+    published = item.get('published')
+    return (published if published is not None else float('-inf'),
+            -item.get('priority', 1), -position)
 
 
-def collect_all_news():
+def new_top_news():
+    """
+    Пустой отборщик лучших новостей категории.
+    
+    Returns:
+        TopK на MAX_NEWS_PER_CATEGORY + TOP_K_BUFFER новостей
+    """
+    return TopK(MAX_NEWS_PER_CATEGORY + TOP_K_BUFFER)
+
+
+def offer_news(selector, news, seen=None):
+    """
+    Передача новостей одного фида в отборщик по мере загрузки.
+    
+    Args:
+        selector: TopK из new_top_news()
+        news: новости фида в порядке фида
+        seen: SeenStore — уже опубликованные новости не рассматриваются
+    """
+    skipped = 0
+    for position, item in enumerate(news):
+        if seen is not None and seen.is_seen(item):
+            skipped += 1
+            continue
+        selector.push(news_rank(item, position), item)
+    
+    if skipped:
+        logger.info(f"  Уже опубликовано ранее: {skipped} новостей")
+
+
+def finish_top_news(selector, seen=None):
+    """
+    Итог отбора: дубликаты убираются среди удержанных новостей,
+    запас TOP_K_BUFFER покрывает выбывшие копии.
+    
+    Args:
+        selector: TopK из new_top_news()
+        seen: SeenStore — новости, которые другая категория отобрала,
+              пока эта ждала свои фиды, отсеиваются; отобранные
+              запоминаются в том же шаге
+    Returns:
+        не более MAX_NEWS_PER_CATEGORY новостей, лучшие первыми
+    """
+    candidates = selector.items()
+    if seen is not None:
+        candidates = [item for item in candidates if not seen.is_seen(item)]
+    top_news = remove_duplicates(candidates)[:MAX_NEWS_PER_CATEGORY]
+    
+    if seen is not None:
+        seen.mark(top_news)
+    return top_news
+
+
+def select_top_news(feeds_news, seen=None):
+    """
+    Отбор лучших новостей категории: без дубликатов, свежие первыми.
+    Полный список категории не собирается и не сортируется — новости
+    проходят через кучу из MAX_NEWS_PER_CATEGORY + TOP_K_BUFFER элементов.
+    
+    Args:
+        feeds_news: итератор списков новостей (по одному на фид)
+        seen: SeenStore — новости, уже вошедшие в другую категорию
+              или в прошлые запуски, отсеиваются, отобранные запоминаются
+    Returns:
+        не более MAX_NEWS_PER_CATEGORY новостей
+    """
+    selector = new_top_news()
+    for news in feeds_news:
+        offer_news(selector, news, seen)
+    return finish_top_news(selector, seen)
+
+
+def make_podcast(item, category, podcast_id):
+    """
+    Формирование подкаст-записи из новости.
+    
+    Args:
+        item: новость из fetch_feed
+        category: название категории
+        podcast_id: id подкаста
+    Returns:
+        словарь подкаста
+    """
+    return {
+        "id": podcast_id,
+        "title": item['title'],
+        "category": category,
+        "date": item['date'],
+        "published": item.get('published'),
+        "image": item['image'],
+        "audio": "",  # Заполнится после озвучки
+        "description": item['description'],
+        "source": item['source'],
+        "link": item['link']
+    }
+
+
+async def stream_categories(concurrency=FETCH_CONCURRENCY, cache=None, seen=None):
+    """
+    Асинхронный генератор категорий по мере готовности.
+    Все фиды качаются сразу; категория отдаётся, как только загружены
+    все её источники, не дожидаясь остальных категорий.
+    
+    Args:
+        concurrency: максимум одновременных запросов
+        cache: словарь кэша фидов (необязательно)
+        seen: SeenStore для отсева повторов (категории сверяются
+              в порядке готовности)
+    Yields:
+        кортежи (категория, отобранные новости)
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    async def collect_category(category, feeds):
+        # Новости фида уходят в отбор сразу после его загрузки
+        selector = new_top_news()
+        for next_feed in asyncio.as_completed(
+            [fetch_feed_async(feed_config, semaphore, cache) for feed_config in feeds]
+        ):
+            offer_news(selector, await next_feed, seen)
+        return category, finish_top_news(selector, seen)
+    
+    tasks = [
+        asyncio.ensure_future(collect_category(category, feeds))
+        for category, feeds in RSS_FEEDS.items()
+    ]
+    for next_done in asyncio.as_completed(tasks):
+        category, top_news = await next_done
+        logger.info(f"  Готова категория {category}: {len(top_news)} новостей")
+        yield category, top_news
+
+
+def collect_all_news(concurrency=FETCH_CONCURRENCY, use_cache=True, skip_seen=False):
     """
     Главная функция: сбор новостей из всех категорий.
+    Новость, попавшая в одну категорию, не повторяется в следующих.
     
+    Args:
+        concurrency: сколько фидов качать одновременно
+                     (1 — последовательная загрузка, как раньше)
+        use_cache: использовать условные запросы и кэш фидов
+        skip_seen: отсеивать новости, опубликованные в прошлых запусках
     Returns:
         список всех подкастов [{id, title, category, date, image, audio, description}]
     """
@@ -262,43 +908,37 @@ def collect_all_news():
     
     all_podcasts = []
     podcast_id = 1
+    cache = load_feed_cache() if use_cache else None
+    seen = open_seen_store(skip_seen)
+    
+    # Все фиды качаем параллельно ещё до разбора по категориям
+    fetched = None
+    if concurrency > 1:
+        fetched = asyncio.run(fetch_all_feeds(concurrency, cache))
     
     for category, feeds in RSS_FEEDS.items():
         logger.info(f"\n--- Категория: {category} ---")
-        category_news = []
-        
-        # Собираем новости из всех источников категории
-        for feed_config in feeds:
-            news = fetch_feed(feed_config)
-            category_news.extend(news)
-        
-        # Убираем дубликаты
-        category_news = remove_duplicates(category_news)
         
-        # Сортируем по дате (свежие первыми)
-        category_news.sort(key=lambda x: x['date'], reverse=True)
+        # Новости всех источников категории — по одному фиду за раз
+        if fetched is not None:
+            feeds_news = fetched[category]
+        else:
+            feeds_news = (fetch_feed(feed_config, cache) for feed_config in feeds)
         
-        # Берём только нужное количество
-        category_news = category_news[:MAX_NEWS_PER_CATEGORY]
+        category_news = select_top_news(feeds_news, seen)
         
         # Формируем подкаст-записи
         for item in category_news:
-            podcast = {
-                "id": podcast_id,
-                "title": item['title'],
-                "category": category,
-                "date": item['date'],
-                "image": item['image'],
-                "audio": "",  # Заполнится после озвучки
-                "description": item['description'],
-                "source": item['source'],
-                "link": item['link']
-            }
-            all_podcasts.append(podcast)
+            all_podcasts.append(make_podcast(item, category, podcast_id))
             podcast_id += 1
         
         logger.info(f"  Итого {category}: {len(category_news)} новостей")
     
+    if cache is not None:
+        save_feed_cache(cache)
+    seen.close()
+    http_client.close_client()
+    
     logger.info(f"\n{'=' * 50}")
     logger.info(f"ИТОГО: {len(all_podcasts)} подкастов собрано")
     logger.info(f"{'=' * 50}")
@@ -306,19 +946,77 @@ def collect_all_news():
     return all_podcasts
 
 
+def load_previous_podcasts():
+    """
+    Загрузка podcasts.json прошлого запуска (для инкрементального режима).
+    
+    Returns:
+        список подкастов или пустой список
+    """
+    output_path = os.path.join(OUTPUT_DIR, 'podcasts.json')
+    
+    try:
+        with open(output_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+    except (json.JSONDecodeError, OSError) as e:
+        logger.warning(f"Не удалось прочитать прошлый podcasts.json: {e}")
+        return []
+
+
+def carry_over_audio(podcasts, previous):
+    """
+    Перенос аудио из прошлого запуска для неизменившихся новостей.
+    Новость считается той же, если совпадают ссылка, заголовок и описание;
+    новые и изменившиеся новости остаются без аудио и будут озвучены.
+    
+    Args:
+        podcasts: свежий список подкастов (изменяется на месте)
+        previous: список подкастов прошлого запуска
+    Returns:
+        количество перенесённых аудио
+    """
+    known = {
+        (p.get('link'), p.get('title'), p.get('description')): p.get('audio', '')
+        for p in previous
+        if p.get('audio')
+    }
+    
+    carried = 0
+    for podcast in podcasts:
+        audio = known.get((podcast['link'], podcast['title'], podcast['description']))
+        if audio:
+            podcast['audio'] = audio
+            carried += 1
+    
+    logger.info(f"Инкрементально: {carried} из {len(podcasts)} новостей уже озвучены")
+    return carried
+
+
+@metrics.timed('save_podcasts')
 def save_podcasts(podcasts):
     """
-    Сохранение подкастов в JSON-файл.
+    Запись выпуска в базу статей и выгрузка из неё podcasts.json
+    и статических частей архива (data/latest.json и месячные части).
     
     Args:
         podcasts: список подкастов
+    Returns:
+        выгруженный список подкастов
     """
     output_path = os.path.join(OUTPUT_DIR, 'podcasts.json')
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(podcasts, f, ensure_ascii=False, indent=2)
+    with ArticleStore(ARTICLE_STORE_FILE) as store:
+        store.sync_feeds(RSS_FEEDS)
+        run_id = store.record_run(podcasts)
+        exported = store.export_podcasts(run_id)
+        exporter.export_static(store, OUTPUT_DIR, months={p['date'][:7] for p in exported})
+    
+    precompress.write_json(output_path, exported, 'podcasts.json')
     
-    logger.info(f"Сохранено в {output_path}")
+    logger.info(f"Сохранено в {output_path} (запуск №{run_id} в {ARTICLE_STORE_FILE})")
+    return exported
 
 
 def save_texts_for_tts(podcasts):
@@ -332,20 +1030,70 @@ def save_texts_for_tts(podcasts):
     texts_dir = os.path.join(OUTPUT_DIR, 'texts')
     os.makedirs(texts_dir, exist_ok=True)
     
+    # Удаляем тексты прошлых запусков, которых нет в текущем списке
+    current = {f"podcast_{podcast['id']}.txt" for podcast in podcasts}
+    for filename in os.listdir(texts_dir):
+        if filename.startswith('podcast_') and filename not in current:
+            os.remove(os.path.join(texts_dir, filename))
+    
     for podcast in podcasts:
         text = f"{podcast['title']}. {podcast['description']}"
         filename = f"podcast_{podcast['id']}.txt"
         filepath = os.path.join(texts_dir, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(text)
+        atomic_io.write_text(filepath, text)
     
     logger.info(f"Тексты для озвучки сохранены в {texts_dir}/")
 
 
+def parse_args():
+    """
+    Разбор аргументов командной строки.
+    
+    Returns:
+        argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description='GameNews — сбор RSS-новостей')
+    parser.add_argument(
+        '--concurrency', type=int, default=FETCH_CONCURRENCY,
+        help='сколько фидов качать одновременно (1 — последовательно)'
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help='не использовать ETag / Last-Modified и кэш фидов'
+    )
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help='сохранить аудио неизменившихся новостей из прошлого podcasts.json'
+    )
+    parser.add_argument(
+        '--no-stream-parse', action='store_true',
+        help='скачивать фид целиком и разбирать feedparser'
+    )
+    parser.add_argument(
+        '--skip-seen', action='store_true',
+        help='отсеивать новости, опубликованные в прошлых запусках'
+    )
+    parser.add_argument(
+        '--http2', action='store_true',
+        help='качать фиды по HTTP/2 (нужен httpx[http2])'
+    )
+    return parser.parse_args()
+
+
 # === ЗАПУСК ===
 if __name__ == '__main__':
-    podcasts = collect_all_news()
+    args = parse_args()
+    STREAM_PARSE = not args.no_stream_parse
+    http_client.HTTP2 = http_client.HTTP2 or args.http2
+    podcasts = collect_all_news(
+        concurrency=args.concurrency,
+        use_cache=not args.no_cache,
+        skip_seen=args.skip_seen
+    )
+    if args.incremental:
+        carry_over_audio(podcasts, load_previous_podcasts())
     save_podcasts(podcasts)
     save_texts_for_tts(podcasts)
+    metrics.write_report(RUN_REPORT_FILE)
     logger.info("Готово!")
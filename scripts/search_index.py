@@ -0,0 +1,183 @@
+"""
+GameNews — Поисковый индекс для чата на сайте
+Индекс строится при выгрузке и лежит статическим файлом data/search.<хэш>.json:
+страница не сканирует все статьи на каждый запрос, а находит их
+по словарю основ слов за доли миллисекунды.
+
+- Русские слова приводятся к основе отсечением окончаний
+  (правила лежат в самом индексе, поэтому страница стеммит так же).
+- Для слов, которых нет в словаре (названия игр, ники игроков, опечатки),
+  кандидаты подбираются по общим триграммам.
+
+Автор: GameNews Team
+"""
+
+import functools
+import itertools
+import re
+
+# Окончания, отсекаемые от русских слов (проверяются от длинных к коротким)
+SUFFIXES = sorted({
+    # прилагательные и причастия
+    'ыми', 'ими', 'ого', 'его', 'ому', 'ему', 'ая', 'яя', 'ое', 'ее', 'ые', 'ие',
+    'ый', 'ий', 'ой', 'ую', 'юю', 'ых', 'их', 'ым', 'им', 'ом', 'ем',
+    # существительные
+    'ами', 'ями', 'иях', 'ях', 'ах', 'ов', 'ев', 'ей', 'ам', 'ям', 'ия', 'ья',
+    'ье', 'ию', 'ью', 'ии', 'а', 'я', 'о', 'е', 'ы', 'и', 'у', 'ю', 'ь', 'й',
+    # глаголы
+    'ться', 'тся', 'ать', 'ять', 'ить', 'еть', 'уть', 'ешь', 'ишь', 'ет', 'ит',
+    'ут', 'ют', 'ат', 'ят', 'ла', 'ли', 'ло', 'л',
+}, key=lambda suffix: (-len(suffix), suffix))
+
+# Минимальная длина основы после отсечения окончания
+MIN_STEM = 3
+
+# Слова, не несущие смысла для поиска
+STOPWORDS = sorted({
+    'и', 'в', 'во', 'на', 'с', 'со', 'по', 'не', 'что', 'как', 'для', 'из', 'к', 'ко',
+    'о', 'об', 'от', 'за', 'а', 'но', 'или', 'у', 'до', 'же', 'ли', 'это', 'все', 'так',
+    'про', 'при', 'the', 'a', 'an', 'of', 'and', 'in', 'on', 'to', 'for',
+})
+
+# Минимальное сходство по триграммам для нечёткого совпадения
+TRIGRAM_THRESHOLD = 0.4
+
+_WORD = re.compile(r'\w+')
+_CYRILLIC = re.compile(r'[а-я]')
+_STOPWORDS = set(STOPWORDS)
+
+
+@functools.lru_cache(maxsize=65536)
+def stem(word):
+    """
+    Основа слова: у русских слов отсекается одно окончание,
+    латиница и числа не меняются.
+    """
+    if not _CYRILLIC.search(word):
+        return word
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[:-len(suffix)]
+    return word
+
+
+def terms(text):
+    """
+    Основы слов текста для индекса (без стоп-слов и однобуквенных).
+
+    Returns:
+        список основ в порядке появления
+    """
+    words = _WORD.findall(text.lower().replace('ё', 'е'))
+    return [stem(word) for word in words if len(word) > 1 and word not in _STOPWORDS]
+
+
+def trigrams(term):
+    """
+    Триграммы основы с пробелами по краям: 'gta' → {' gt', 'gta', 'ta '}.
+    """
+    padded = f" {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def build_index(podcasts):
+    """
+    Построение поискового индекса.
+
+    Args:
+        podcasts: статьи от свежих к старым (номер в списке — номер документа)
+    Returns:
+        словарь для data/search.json:
+        docs — [заголовок, категория, дата, картинка, аудио, ссылка, длительность],
+        terms — {основа: номер}, postings — номера документов для основы
+        (разностями: [3, 2, 10] — документы 3, 5, 15),
+        trigrams — {триграмма: номера основ}, stemmer — правила стемминга
+    """
+    term_ids = {}
+    postings = []
+
+    for doc_id, podcast in enumerate(podcasts):
+        text = f"{podcast['title']} {podcast.get('description', '')} {podcast['category']}"
+        for term in dict.fromkeys(terms(text)):
+            term_id = term_ids.setdefault(term, len(postings))
+            if term_id == len(postings):
+                postings.append([])
+            postings[term_id].append(doc_id)
+
+    trigram_index = {}
+    for term, term_id in term_ids.items():
+        if len(term) < 3:
+            continue
+        for trigram in sorted(trigrams(term)):
+            trigram_index.setdefault(trigram, []).append(term_id)
+
+    return {
+        "version": 1,
+        "stemmer": {"suffixes": SUFFIXES, "min_stem": MIN_STEM, "stopwords": STOPWORDS},
+        "trigram_threshold": TRIGRAM_THRESHOLD,
+        "docs": [
+            [p['title'], p['category'], p['date'], p.get('image', ''), p.get('audio', ''),
+             p.get('link', ''), p.get('duration_sec')]
+            for p in podcasts
+        ],
+        "terms": term_ids,
+        "postings": [_deltas(docs) for docs in postings],
+        # Порядок ключей не зависит от хэшей строк процесса: одинаковый архив
+        # даёт побайтно одинаковый индекс (и то же имя search.<хэш>.json)
+        "trigrams": dict(sorted(trigram_index.items())),
+    }
+
+
+def _deltas(doc_ids):
+    """
+    Разностное кодирование возрастающего списка: номера короче в JSON.
+    """
+    return [doc_id - previous for previous, doc_id in zip([0] + doc_ids, doc_ids)]
+
+
+def _doc_ids(deltas):
+    """
+    Номера документов из разностей.
+    """
+    return list(itertools.accumulate(deltas))
+
+
+def search(index, query, limit=10):
+    """
+    Поиск по индексу (та же логика, что в index.html; для проверки и отладки).
+
+    Args:
+        index: результат build_index
+        query: строка запроса
+        limit: сколько документов вернуть
+    Returns:
+        номера документов: больше совпавших слов — выше, затем свежее
+    """
+    scores = {}
+    for term in dict.fromkeys(terms(query)):
+        for doc_id in _matching_docs(index, term):
+            scores[doc_id] = scores.get(doc_id, 0) + 1
+    return sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))[:limit]
+
+
+def _matching_docs(index, term):
+    """
+    Документы с основой term, а если её нет в словаре — с похожими по триграммам.
+    """
+    term_id = index['terms'].get(term)
+    if term_id is not None:
+        return _doc_ids(index['postings'][term_id])
+
+    query_trigrams = trigrams(term)
+    shared = {}
+    for trigram in query_trigrams:
+        for candidate in index['trigrams'].get(trigram, ()):
+            shared[candidate] = shared.get(candidate, 0) + 1
+
+    vocabulary = list(index['terms'])
+    docs = set()
+    for candidate, count in shared.items():
+        union = len(query_trigrams) + len(vocabulary[candidate]) - count
+        if count / union >= index['trigram_threshold']:
+            docs.update(_doc_ids(index['postings'][candidate]))
+    return sorted(docs)
@@ -0,0 +1,100 @@
+"""
+GameNews — Хранилище уже опубликованных новостей
+Компактная SQLite-таблица отпечатков (нормализованный заголовок и ссылка)
+с ограничением по времени жизни. Через неё collect_all_news отсекает
+новость, которая уже вошла в другую категорию этого запуска
+или была опубликована в одном из прошлых запусков.
+
+Автор: GameNews Team
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import time
+
+# Сколько дней помнить опубликованную новость
+SEEN_TTL_DAYS = 3
+
+
+def fingerprints(item):
+    """
+    Отпечатки новости: по заголовку (та же нормализация, что в
+    remove_duplicates) и по ссылке.
+
+    Args:
+        item: новость с title и link
+    Returns:
+        список коротких строковых ключей
+    """
+    normalized = re.sub(r'[^\w\s]', '', item['title'].lower().strip())
+    keys = ['t' + hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]]
+    if item.get('link'):
+        keys.append('l' + hashlib.sha1(item['link'].encode('utf-8')).hexdigest()[:16])
+    return keys
+
+
+class SeenStore:
+    """
+    Отпечатки опубликованных новостей с истечением срока.
+    path=':memory:' — только текущий запуск (без истории между запусками).
+    """
+
+    def __init__(self, path=':memory:', ttl_days=SEEN_TTL_DAYS):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS seen ('
+            ' key TEXT PRIMARY KEY,'
+            ' first_seen REAL NOT NULL,'
+            ' last_seen REAL NOT NULL'
+            ') WITHOUT ROWID'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS seen_last ON seen(last_seen)')
+        self.purge(ttl_days)
+
+    def purge(self, ttl_days):
+        """
+        Удаление отпечатков старше ttl_days.
+
+        Returns:
+            сколько записей удалено
+        """
+        cutoff = time.time() - ttl_days * 86400
+        removed = self.conn.execute('DELETE FROM seen WHERE last_seen < ?', (cutoff,)).rowcount
+        self.conn.commit()
+        return removed
+
+    def is_seen(self, item):
+        """
+        Была ли новость уже опубликована (в этом или прошлых запусках).
+        """
+        keys = fingerprints(item)
+        placeholders = ','.join('?' * len(keys))
+        row = self.conn.execute(
+            f'SELECT 1 FROM seen WHERE key IN ({placeholders}) LIMIT 1', keys
+        ).fetchone()
+        return row is not None
+
+    def mark(self, items):
+        """
+        Запоминание опубликованных новостей.
+
+        Args:
+            items: список новостей
+        """
+        now = time.time()
+        self.conn.executemany(
+            'INSERT INTO seen (key, first_seen, last_seen) VALUES (?, ?, ?)'
+            ' ON CONFLICT(key) DO UPDATE SET last_seen = excluded.last_seen',
+            [(key, now, now) for item in items for key in fingerprints(item)]
+        )
+
+    def close(self):
+        """
+        Сохранение изменений и закрытие базы.
+        """
+        self.conn.commit()
+        self.conn.close()
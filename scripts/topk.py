@@ -0,0 +1,55 @@
+"""
+GameNews — Потоковый отбор лучших K элементов
+Вместо сортировки всего списка ради пяти новостей элементы проходят
+через min-кучу фиксированного размера: в памяти никогда не больше
+size элементов, добавление — O(log size).
+
+Автор: GameNews Team
+"""
+
+import heapq
+import itertools
+
+
+class TopK:
+    """
+    Лучшие size элементов по ключу (больший ключ — лучше).
+    При равных ключах выигрывает добавленный раньше.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._heap = []
+        # Порядковый номер: разрешает равенство ключей без сравнения самих элементов
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, key, item):
+        """
+        Добавление элемента; худший из удерживаемых вытесняется.
+
+        Args:
+            key: ключ ранжирования (сравнимый, например кортеж)
+            item: элемент
+        Returns:
+            True, если элемент попал в кучу
+        """
+        if self.size <= 0:
+            return False
+        # Отрицательный номер: при равном ключе «хуже» тот, что пришёл позже
+        entry = (key, -next(self._counter), item)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:2] <= self._heap[0][:2]:
+            return False
+        heapq.heapreplace(self._heap, entry)
+        return True
+
+    def items(self):
+        """
+        Удерживаемые элементы от лучшего к худшему.
+        """
+        return [item for _, _, item in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
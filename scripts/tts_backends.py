@@ -0,0 +1,171 @@
+"""
+GameNews — Движки озвучки (TTS)
+Единый интерфейс для generate_audio: каждый движок умеет synthesize(text, path)
+и сообщает voice_id — строку, которая входит в ключ аудиокэша.
+
+Сетевые движки сообщают host — по нему resilience ограничивает
+частоту запросов и повторяет временные ошибки.
+
+Движки:
+- gtts   — Google Text-to-Speech (сеть, по умолчанию)
+- espeak — локальный espeak-ng + ffmpeg, работает офлайн на CPU
+- null   — заглушка для тестов и бенчмарков: пишет тишину в MP3
+
+Автор: GameNews Team
+"""
+
+import shutil
+import subprocess
+import time
+
+# Один кадр MPEG-1 Layer III, 128 кбит/с, 44.1 кГц, моно, без CRC.
+# Нулевые side info и данные декодируются как тишина.
+SILENT_FRAME = bytes.fromhex('fffb90c4') + bytes(413)
+SILENT_FRAME_SEC = 1152 / 44100
+
+
+class GTTSBackend:
+    """Google Text-to-Speech через библиотеку gTTS."""
+
+    name = 'gtts'
+    host = 'translate.google.com'
+
+    def __init__(self, lang='ru', slow=False, timeout=None):
+        from gtts import gTTS
+        self._gtts = gTTS
+        self.lang = lang
+        self.slow = slow
+        self.timeout = timeout
+
+    @property
+    def voice_id(self):
+        # Совпадает с прежним форматом ключа, чтобы не терять накопленный кэш
+        return f"{self.lang}\n{int(self.slow)}"
+
+    def request_count(self, text):
+        """
+        Сколько запросов к Google сделает озвучка: gTTS режет текст
+        на куски до 100 символов и запрашивает каждый отдельно.
+
+        Args:
+            text: текст для озвучки
+        Returns:
+            число запросов
+        """
+        tts = self._gtts(text=text, lang=self.lang, slow=self.slow, timeout=self.timeout)
+        try:
+            return max(1, len(tts._tokenize(text)))
+        except AttributeError:
+            # Другая версия gTTS — оценка по предельной длине куска
+            return max(1, -(-len(text) // self._gtts.GOOGLE_TTS_MAX_CHARS))
+
+    def synthesize(self, text, path):
+        """
+        Озвучка текста в MP3-файл.
+
+        Args:
+            text: текст для озвучки
+            path: путь к MP3-файлу
+        """
+        self._gtts(text=text, lang=self.lang, slow=self.slow, timeout=self.timeout).save(path)
+
+
+class EspeakBackend:
+    """
+    Локальный офлайн-движок: espeak-ng синтезирует WAV, ffmpeg кодирует в MP3.
+    Требует установленных espeak-ng и ffmpeg (apt install espeak-ng ffmpeg).
+    """
+
+    name = 'espeak'
+    host = None
+
+    def __init__(self, voice='ru', speed=160, bitrate='64k'):
+        missing = [tool for tool in ('espeak-ng', 'ffmpeg') if not shutil.which(tool)]
+        if missing:
+            raise RuntimeError(f"Для движка espeak не найдены программы: {', '.join(missing)}")
+        self.voice = voice
+        self.speed = speed
+        self.bitrate = bitrate
+
+    @property
+    def voice_id(self):
+        return f"espeak-ng\n{self.voice}\n{self.speed}"
+
+    def synthesize(self, text, path):
+        """
+        Озвучка текста в MP3-файл.
+
+        Args:
+            text: текст для озвучки
+            path: путь к MP3-файлу
+        """
+        wav = subprocess.run(
+            ['espeak-ng', '-v', self.voice, '-s', str(self.speed), '--stdin', '--stdout'],
+            input=text.encode('utf-8'),
+            capture_output=True,
+            check=True
+        ).stdout
+        subprocess.run(
+            ['ffmpeg', '-loglevel', 'error', '-y', '-f', 'wav', '-i', 'pipe:0',
+             '-codec:a', 'libmp3lame', '-b:a', self.bitrate, '-f', 'mp3', path],
+            input=wav,
+            capture_output=True,
+            check=True
+        )
+
+
+class NullBackend:
+    """
+    Заглушка: ждёт latency секунд и пишет тишину длительностью,
+    пропорциональной длине текста (chars_per_sec символов в секунду).
+    """
+
+    name = 'null'
+    host = None
+
+    def __init__(self, latency=0.0, chars_per_sec=15):
+        self.latency = latency
+        self.chars_per_sec = chars_per_sec
+
+    @property
+    def voice_id(self):
+        return 'null'
+
+    def synthesize(self, text, path):
+        """
+        Запись MP3-файла с тишиной.
+
+        Args:
+            text: текст (используется только его длина)
+            path: путь к MP3-файлу
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        seconds = max(1.0, len(text) / self.chars_per_sec)
+        frames = int(seconds / SILENT_FRAME_SEC) + 1
+        with open(path, 'wb') as f:
+            f.write(SILENT_FRAME * frames)
+
+
+BACKENDS = {
+    GTTSBackend.name: GTTSBackend,
+    EspeakBackend.name: EspeakBackend,
+    NullBackend.name: NullBackend,
+}
+
+
+def create_backend(name, **options):
+    """
+    Создание движка по имени.
+
+    Args:
+        name: gtts, espeak или null
+        options: параметры конструктора движка
+    Returns:
+        экземпляр движка
+    """
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Неизвестный движок TTS: {name} (доступны: {', '.join(BACKENDS)})")
+    return backend_class(**options)